@@ -0,0 +1,247 @@
+from argparse import ArgumentParser
+from json import dump, load
+from time import perf_counter
+import os
+import sys
+
+from core.letterset import LetterSet
+from core.lexicon import get_lexicon, read_words, DEFAULT_WORDS_PATH
+from core.movegen import generate_moves
+from core.simulation import play_game
+
+from benchmarks.fixtures import STAGES, game_fixture
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def measure(func, min_time=0.2, repeat=3):
+    '''
+    Get the best time per call of func over repeat rounds of at least min_time seconds
+    '''
+    number = 1
+    while True:
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (perf_counter() - start) / number)
+    return best
+
+
+def benchmarks():
+    '''
+    Yields (name, func) for every benchmark
+    '''
+    lexicon = get_lexicon()
+    words = list(read_words(DEFAULT_WORDS_PATH))[::1000]
+    words += [w[::-1] + 'q' for w in words]
+    yield 'lexicon.lookup', lambda: [w in lexicon for w in words]
+
+    letter_set = LetterSet()
+    yield 'letterset.draw', lambda: letter_set.put_back(letter_set.draw(7))
+
+    for stage in STAGES:
+        game = game_fixture(stage)
+        board, letters = game.board, game.letters
+        rack = game.current_player.letters if game.current_player else ''
+        moves = generate_moves(board, rack, letter_set=letters)[:20]
+
+        yield 'board.get_words.%s' % stage, lambda board=board: list(board.get_words())
+        yield 'board.get_word_score.%s' % stage, lambda board=board, letters=letters, moves=moves: \
+            [board.get_word_score(letters, m.x, m.y, m.direction, m.word) for m in moves]
+        yield 'movegen.generate.%s' % stage, lambda board=board, letters=letters, rack=rack: \
+            generate_moves(board, rack, letter_set=letters)
+
+    yield 'simulation.play_game', lambda: play_game(205)
+
+
+def check_repaints():
+    '''
+    Drag a tile over the board and the rack and check that moving within a cell repaints
+    nothing and moving to another cell repaints exactly the two cells involved
+    :return: The failed checks, or None if PyQt5 is not installed
+    '''
+    try:
+        from PyQt5.QtCore import QPointF
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return None
+    app = QApplication.instance() or QApplication(['bench', '-platform', 'offscreen'])
+    from ui.board_ui import BoardUI
+    from ui.racktile_ui import RackTileUI
+
+    class Drag:
+        '''
+        A tile being dragged, only its center is needed
+        '''
+        point = None
+
+        def center(self):
+            return self.point
+
+    board, rack = BoardUI(15, 15), RackTileUI(7, 15, 15)
+    cells = {
+        'board': (board, lambda x, dx: QPointF(board.LEGEND_SIZE + (x + dx) * board.CELL_SIZE,
+                                               board.LEGEND_SIZE + 3.5 * board.CELL_SIZE)),
+        'rack': (rack, lambda x, dx: rack.mapToScene(QPointF((x + dx) * rack.CELL_SIZE,
+                                                             rack.LEGEND_SIZE + rack.CELL_SIZE / 2))),
+    }
+    failures = []
+    drag = Drag()
+    for name, (item, point) in cells.items():
+        steps = [('same cell', point(2, 0.3), 0), ('same cell', point(2, 0.7), 0),
+                 ('next cell', point(3, 0.5), 2)]
+        drag.point = point(2, 0.5)
+        item.letterMoveEvent(drag)
+        for label, drag.point, expected in steps:
+            before = item.repaint_count
+            item.letterMoveEvent(drag)
+            if item.repaint_count - before != expected:
+                failures.append('%s %s: %i repaints, expected %i' % (
+                    name, label, item.repaint_count - before, expected))
+    return failures
+
+
+def analytics_reference(records):
+    '''
+    Summarize decoded GameRecords one move at a time, as core.analytics.summarize does on
+    the encoded archive
+    '''
+    from core.layout import get_layout
+    from core.lexicon import ALPHABET
+    from core.player import Player
+
+    layout = get_layout()
+    points = {c: score for c, (score, _) in LetterSet()}
+    turns = words = bingos = tiles = premiums = score = letter_points = word_lengths = 0
+    first_wins = margin = 0
+    played = dict.fromkeys(ALPHABET, 0)
+    for record in records:
+        totals = [0] * len(record.players)
+        for turn, (kind, data, turn_score, word_length, bag) in enumerate(record.turns):
+            turns += 1
+            score += turn_score
+            totals[turn % len(totals)] += turn_score
+            if kind != Player.PLACE_WORD:
+                continue
+            words += 1
+            bingos += len(data) == record.rack_size
+            tiles += len(data)
+            word_lengths += word_length
+            for x, y, c in data:
+                square = y * record.width + x
+                premiums += layout.letter_multipliers[square] > 1 or layout.word_multipliers[square] > 1
+                letter_points += points[c]
+                played[c] += 1
+        best_other = max(totals[1:], default=0)
+        first_wins += totals[0] > best_other
+        margin += totals[0] - best_other
+    games = len(records)
+    return {
+        'games': games,
+        'turns': turns,
+        'average_score_per_turn': score / turns if turns else 0,
+        'average_score_per_word': score / words if words else 0,
+        'average_word_length': word_lengths / words if words else 0,
+        'bingo_rate': bingos / words if words else 0,
+        'premiums_per_word': premiums / words if words else 0,
+        'first_player_win_rate': first_wins / games if games else 0,
+        'first_player_margin': margin / games if games else 0,
+        'letter_points_per_tile': letter_points / tiles if tiles else 0,
+        'letters_played': played,
+    }
+
+
+def check_analytics(games=4):
+    '''
+    Summarize an archive of simulated games, some with names of the longest length
+    recorded, and check it against analytics_reference on the decoded records
+    :return: The failed checks, or None if NumPy is not installed
+    '''
+    try:
+        from core.analytics import summarize
+    except ImportError:
+        return None
+    from tempfile import TemporaryDirectory
+    from core.record import MAX_TEXT, GameArchive, GameRecord
+
+    records = []
+    for seed in range(games):
+        record = GameRecord.decode(play_game(seed, record=True)['record'])
+        records.append(record)
+        renamed = GameRecord.decode(record.encode())
+        renamed.players = ['x' * MAX_TEXT] + renamed.players[1:]
+        records.append(renamed)
+
+    with TemporaryDirectory() as tmp:
+        with GameArchive(os.path.join(tmp, 'games.rec')) as archive:
+            archive.extend(records)
+            summary = summarize(archive, chunk_size=3)
+            expected = analytics_reference(list(archive))
+    return ['%s: %r, expected %r' % (name, summary[name], value)
+            for name, value in expected.items() if summary[name] != value]
+
+
+def compare(results, baseline, threshold):
+    '''
+    Get the benchmarks which are more than threshold (a fraction) slower than baseline
+    '''
+    return [(name, baseline[name], value) for name, value in sorted(results.items())
+            if name in baseline and value > baseline[name] * (1 + threshold)]
+
+
+def run():
+    parser = ArgumentParser(description='Run the benchmarks of the core hot paths')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    parser.add_argument('-b', '--baseline', default=BASELINE_PATH, help='baseline JSON to compare with')
+    parser.add_argument('-t', '--threshold', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (default: 0.25)')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('-k', dest='filter', default='', help='only run benchmarks containing this text')
+    args = parser.parse_args()
+
+    results = {}
+    for name, func in benchmarks():
+        if args.filter in name:
+            results[name] = measure(func)
+            print('%-32s %12.1f us' % (name, results[name] * 1e6))
+
+    for path in filter(None, (args.output, args.baseline if args.save_baseline else None)):
+        with open(path, 'w') as f:
+            dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    failures = check_repaints()
+    if failures is None:
+        print('repaint checks skipped, PyQt5 is not installed')
+    for failure in failures or ():
+        print('FAILED repaints %s' % failure)
+
+    analytics_failures = check_analytics()
+    if analytics_failures is None:
+        print('analytics checks skipped, NumPy is not installed')
+    for failure in analytics_failures or ():
+        print('FAILED analytics %s' % failure)
+    failures = (failures or []) + (analytics_failures or [])
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, load(f), args.threshold)
+    for name, before, after in regressions:
+        print('REGRESSION %s: %.1f us -> %.1f us (%+.0f%%)' % (name, before * 1e6, after * 1e6,
+                                                             (after / before - 1) * 100))
+    return 1 if regressions or failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,26 @@
+from core.game import Game
+from core.lexicon import get_lexicon
+from core.player import Player
+from core.strategies import greedy
+
+# Number of moves played by greedy bots for each stage of the game
+STAGES = {'early': 2, 'mid': 8, 'late': 16}
+
+
+def game_fixture(stage, seed=205):
+    '''
+    Get a two player Game played by greedy bots up to stage ('early', 'mid' or 'late')
+    '''
+    game = Game(15, 15, 7, lexicon=get_lexicon(), seed=seed)
+    for i in range(2):
+        game.add_player(Player('Bot %i' % (i + 1), game, color='#000000'))
+
+    while game.get_state() == game.RUNNING and len(game.moves) < STAGES[stage]:
+        game.set_next_player()
+        move = greedy(game, game.current_player)
+        game.play(move) if move else game.pass_turn()
+
+    # Leave the game ready for the next player to move
+    if game.get_state() == game.RUNNING:
+        game.set_next_player()
+    return game
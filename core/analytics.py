@@ -0,0 +1,180 @@
+import numpy as np
+
+from .layout import get_layout
+from .letterset import LetterSet
+from .lexicon import ALPHABET
+from .record import ARCHIVE_MAGIC, DEFAULT_ARCHIVE_PATH, KINDS, RECORD_HEADER, TURN_HEADER, \
+    GameArchive
+from .player import Player
+
+PASS, PLACE_WORD, EXCHANGE_LETTERS = (KINDS.index(k) for k in
+                                      (Player.PASS, Player.PLACE_WORD, Player.EXCHANGE_LETTERS))
+
+# Columns of the per move arrays
+MOVE_FIELDS = ('game', 'turn', 'player', 'kind', 'tiles', 'bingo', 'score', 'word_length',
+               'premiums', 'letter_points', 'bag')
+
+# Games read from the archive at once
+CHUNK_SIZE = 10000
+
+
+def read_uint16(data, pos):
+    '''
+    Read the little endian uint16 at each of the positions pos of data
+    '''
+    return data[pos].astype(np.int64) | (data[pos + 1].astype(np.int64) << 8)
+
+
+def parse_chunk(data, starts, first_game, premium, points):
+    '''
+    Parse the records of a chunk of games into per move arrays. data holds the encoded
+    records (a uint8 array) which start at starts. The records are walked for all games at
+    once, one turn at a time, so no Python object is made per move.
+    :return: A dict of MOVE_FIELDS arrays, the count of every letter played and the final
+             score of every player of every game (in order of play)
+    '''
+    games = len(starts)
+    width = data[starts + 8].astype(np.int64)
+    rack_size = data[starts + 10].astype(np.int64)
+    players = data[starts + 11].astype(np.int64)
+    draws = read_uint16(data, starts + 12)
+    turns = read_uint16(data, starts + 14)
+
+    # Skip the player names and draws, which are length prefixed strings
+    pos = starts + RECORD_HEADER.size
+    texts = players + draws
+    for i in range(int(texts.max(initial=0))):
+        active = i < texts
+        pos[active] += 1 + data[pos[active]].astype(np.int64)
+
+    columns = {field: [] for field in MOVE_FIELDS}
+    letters = np.zeros(256, dtype=np.int64)
+    totals = np.zeros((games, int(players.max(initial=1))), dtype=np.int64)
+    game_ids = np.arange(first_game, first_game + games)
+    for turn in range(int(turns.max(initial=0))):
+        active = turn < turns
+        p = pos[active]
+        w = width[active]
+        kind = data[p].astype(np.int64)
+        count = data[p + 1].astype(np.int64)
+        placed = kind == PLACE_WORD
+
+        # Tiles are (x, y, letter), only the first count of each move are real
+        tile_premiums = np.zeros(len(p), dtype=np.int64)
+        tile_points = np.zeros(len(p), dtype=np.int64)
+        for t in range(int(count[placed].max(initial=0))):
+            real = placed & (t < count)
+            tile = p[real] + TURN_HEADER.size + 3 * t
+            square = data[tile + 1].astype(np.int64) * w[real] + data[tile]
+            tile_premiums[real] += premium[square]
+            tile_points[real] += points[data[tile + 2]]
+            letters += np.bincount(data[tile + 2], minlength=256)
+
+        player = turn % players[active]
+        score = read_uint16(data, p + 2)
+        totals[active, player] += score
+
+        columns['game'].append(game_ids[active])
+        columns['turn'].append(np.full(len(p), turn))
+        columns['player'].append(player)
+        columns['kind'].append(kind)
+        columns['tiles'].append(np.where(placed, count, 0))
+        columns['bingo'].append(placed & (count == rack_size[active]))
+        columns['score'].append(score)
+        columns['word_length'].append(data[p + 4].astype(np.int64))
+        columns['premiums'].append(tile_premiums)
+        columns['letter_points'].append(tile_points)
+        columns['bag'].append(data[p + 5].astype(np.int64))
+        pos[active] += TURN_HEADER.size + np.where(placed, 3 * count, count)
+
+    moves = {field: np.concatenate(values) if values else np.zeros(0, dtype=np.int64)
+             for field, values in columns.items()}
+    return moves, letters, totals
+
+
+def iter_chunks(archive, chunk_size=CHUNK_SIZE):
+    '''
+    Yields the per move arrays, letter counts and final scores (see parse_chunk) of
+    chunk_size games of archive at a time. Each chunk is read from the memory-mapped archive in one piece.
+    '''
+    letter_set = LetterSet()
+    points = np.zeros(256, dtype=np.int64)
+    for c, (score, _) in letter_set:
+        points[ord(c)] = score
+    layout = get_layout()
+    premium = (np.frombuffer(layout.letter_multipliers, dtype=np.uint8) > 1) | \
+              (np.frombuffer(layout.word_multipliers, dtype=np.uint8) > 1)
+    premium = premium.astype(np.int64)
+
+    ends = np.frombuffer(archive.index, dtype='<u8').astype(np.int64)
+    data = np.frombuffer(archive.data, dtype=np.uint8)
+    for first in range(0, len(ends), chunk_size):
+        chunk_ends = ends[first:first + chunk_size]
+        begin = ends[first - 1] if first else len(ARCHIVE_MAGIC)
+        chunk = data[begin:chunk_ends[-1]]
+        starts = np.concatenate(([begin], chunk_ends[:-1])) - begin
+        yield parse_chunk(chunk, starts, first, premium, points)
+
+
+def summarize(archive, chunk_size=CHUNK_SIZE):
+    '''
+    Aggregate every game of archive: average score per turn and per word, bingo rate (moves
+    using a full rack), first player advantage and how often each letter was played
+    '''
+    turns = words = bingos = tiles = premiums = score = letter_points = 0
+    word_lengths = 0
+    games = first_wins = 0
+    margin = 0
+    letters = np.zeros(256, dtype=np.int64)
+    for moves, chunk_letters, totals in iter_chunks(archive, chunk_size):
+        placed = moves['kind'] == PLACE_WORD
+        turns += len(moves['kind'])
+        words += int(placed.sum())
+        bingos += int(moves['bingo'].sum())
+        tiles += int(moves['tiles'].sum())
+        premiums += int(moves['premiums'].sum())
+        score += int(moves['score'].sum())
+        letter_points += int(moves['letter_points'].sum())
+        word_lengths += int(moves['word_length'].sum())
+        letters += chunk_letters
+
+        # The first player against the best of the others, 0 in one player games
+        best_other = totals[:, 1:].max(axis=1, initial=0)
+        games += len(totals)
+        first_wins += int((totals[:, 0] > best_other).sum())
+        margin += int((totals[:, 0] - best_other).sum())
+
+    played = {c: int(letters[ord(c)]) for c in ALPHABET}
+    return {
+        'games': games,
+        'turns': turns,
+        'average_score_per_turn': score / turns if turns else 0,
+        'average_score_per_word': score / words if words else 0,
+        'average_word_length': word_lengths / words if words else 0,
+        'bingo_rate': bingos / words if words else 0,
+        'premiums_per_word': premiums / words if words else 0,
+        'first_player_win_rate': first_wins / games if games else 0,
+        'first_player_margin': margin / games if games else 0,
+        'letter_points_per_tile': letter_points / tiles if tiles else 0,
+        'letters_played': played,
+    }
+
+
+def main(args=None):
+    '''
+    Print aggregate statistics of a game archive
+    '''
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog='python -m core.analytics', description=main.__doc__.strip())
+    parser.add_argument('archive', nargs='?', default=DEFAULT_ARCHIVE_PATH, help='game archive')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='games read at once')
+    args = parser.parse_args(args)
+
+    with GameArchive(args.archive) as archive:
+        print(json.dumps(summarize(archive, args.chunk_size), indent=2))
+
+
+if __name__ == '__main__':
+    main()
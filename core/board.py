@@ -1,32 +1,78 @@
 from .letter import Letter
-from itertools import chain
-import pandas as pd
-import os
-
-# Absolute path of Board Multiplier CSV
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-BOARD_MULTIPLIER_PATH = os.path.join(BASE_DIR, 'data', 'board_multiplier.csv')
+from .move import Move
+from .lexicon import ALL_LETTERS, get_lexicon
+from .grid import Grid
+from .layout import get_layout
+from .scoring import score_tiles
 
 class Board:
     '''
-    Board class which contains information about the Scrabble Board
+    Board class which contains information about the Scrabble Board. The tiles are kept in a
+    compact Grid which the engine reads, and as Letter objects for the user interface.
     '''
 
-    def __init__(self, width, height):
+    def __init__(self, width, height, lexicon=None):
         self.width = width
         self.height = height
         self.board = [None for _ in range(0, width * height)]
+        self.grid = Grid(width, height)
+        self.owners = [None]
+        self._lexicon = lexicon
+
+        # Premium squares shared with every other Board
+        self.layout = get_layout()
+        self.letter_multipliers = self.layout.letter_multipliers
+        self.word_multipliers = self.layout.word_multipliers
 
-        # Read Board Multiplier CSV
-        self.board_score = pd.read_csv(BOARD_MULTIPLIER_PATH, header=None)
+        # For every empty square the letters allowed on it by the perpendicular word when
+        # playing in a direction, and the anchors (empty squares next to a tile) where new
+        # words can be hooked on. Both are only updated around newly placed tiles.
+        self.cross_checks = {'right': [ALL_LETTERS] * (width * height),
+                             'down': [ALL_LETTERS] * (width * height)}
+        self.center = int(height / 2) * width + int(width / 2)
+        self.anchors = {self.center}
+        self.count = 0
+
+    @property
+    def lexicon(self):
+        '''
+        The Lexicon used to check words, loaded on first use
+        '''
+        if self._lexicon is None:
+            self._lexicon = get_lexicon()
+        return self._lexicon
+
+    def is_word(self, word):
+        '''
+        Check if word is in the Lexicon
+        '''
+        return word in self.lexicon
+
+    def copy(self):
+        '''
+        Get an independent copy of the board for searching. Letter objects, the layout and
+        the lexicon are shared, everything else is a flat buffer copy.
+        '''
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        board.board = self.board[:]
+        board.grid = self.grid.copy()
+        board.owners = self.owners[:]
+        board.cross_checks = {d: checks[:] for d, checks in self.cross_checks.items()}
+        board.anchors = set(self.anchors)
+        return board
 
     def __iter__(self):
         '''
         Define Board as an Iterator
         '''
-        for i, c in enumerate(self.board):
-            if c is not None:
-                yield (i % self.width, int(i / self.width), c)
+        for y, mask in enumerate(self.grid.rows):
+            x = 0
+            while mask:
+                if mask & 1:
+                    yield (x, y, self.board[y * self.width + x])
+                mask >>= 1
+                x += 1
 
     def add_letter(self, letter):
         '''
@@ -34,6 +80,69 @@ class Board:
         '''
         pos = letter.y * self.width + letter.x
         self.board[pos] = letter
+        if letter.player not in self.owners:
+            self.owners.append(letter.player)
+        self.grid.set(letter.x, letter.y, letter.char, self.owners.index(letter.player))
+        self.count += 1
+        self.update_cross_checks(letter.x, letter.y)
+
+    def remove_letter(self, x, y):
+        '''
+        Remove the Letter at the specified position from the board
+        '''
+        letter = self.board[y * self.width + x]
+        self.board[y * self.width + x] = None
+        self.grid.clear(x, y)
+        self.count -= 1
+        self.update_cross_checks(x, y)
+        return letter
+
+    def update_cross_checks(self, x, y):
+        '''
+        Update the cross checks and anchors after the square at (x, y) changed. Only the
+        empty squares at the ends of the lines through (x, y) are affected.
+        '''
+        cells = self.grid.cells
+        if not cells[y * self.width + x]:
+            self.update_square(x, y)
+        else:
+            self.anchors.discard(y * self.width + x)
+
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            ex, ey = x + dx, y + dy
+            while 0 <= ex < self.width and 0 <= ey < self.height and cells[ey * self.width + ex]:
+                ex, ey = ex + dx, ey + dy
+            if 0 <= ex < self.width and 0 <= ey < self.height:
+                self.update_square(ex, ey)
+
+        # The centre is the only anchor of an empty board
+        if self.count == 0:
+            self.anchors = {self.center}
+        elif self.count == 1 and not cells[self.center]:
+            self.update_square(self.center % self.width, int(self.center / self.width))
+
+    def get_lines(self, x, y):
+        '''
+        Get the letters directly left of, right of, above and below the square at (x, y)
+        '''
+        row, column = self.grid.row(y), self.grid.column(x)
+        return (row[:x].rsplit(b'\0', 1)[-1].decode(), row[x + 1:].split(b'\0', 1)[0].decode(),
+                column[:y].rsplit(b'\0', 1)[-1].decode(), column[y + 1:].split(b'\0', 1)[0].decode())
+
+    def update_square(self, x, y):
+        '''
+        Recompute the cross checks and the anchor state of the empty square at (x, y)
+        '''
+        pos = y * self.width + x
+        left, right, above, below = self.get_lines(x, y)
+        self.cross_checks['right'][pos] = self.lexicon.cross_check(above, below) \
+            if above or below else ALL_LETTERS
+        self.cross_checks['down'][pos] = self.lexicon.cross_check(left, right) \
+            if left or right else ALL_LETTERS
+        if above or below or left or right:
+            self.anchors.add(pos)
+        else:
+            self.anchors.discard(pos)
 
     # DEPRECATE - NOT USED
     # def add_word(self, x, y, direction, word, player=None):
@@ -69,20 +178,7 @@ class Board:
         '''
         Returns a generator which yields all words on the board
         '''
-        for line in chain(self.get_rows(), self.get_columns()):
-            word = []
-            for letter in line:
-                if letter is None:
-                    if len(word) > 1:
-                        yield (word[0].x, word[0].y, 'right' if word[0].x != word[1].x else 'down',
-                               ''.join(l.char for l in word))
-                    word = []
-                else:
-                    word.append(letter)
-
-            if len(word) > 1:
-                yield (word[0].x, word[0].y, 'right' if word[0].x != word[1].x else 'down',
-                       ''.join(l.char for l in word))
+        return self.grid.get_words()
 
     def get_word_score(self, letter_set, x, y, direction, word):
         '''
@@ -92,67 +188,14 @@ class Board:
         :param y: Y-coordinate of the starting letter
         :param direction: Direction of the word being placed
         :param word: The word that is being placed
-        :return: Score of the word placed (with bonuses applied)
+        :return: Score of the words placed (with bonuses applied)
         '''
+        return self.score_word(letter_set, x, y, direction, word)[0]
 
-        # Takes the parameters and merges them into a single list (letters) in the following format:
-        # [[x-coord, y-coord, letter1], [x-coord, y-coord, letter2] ... ]
-        # Uses list comprehension to check if down, add to x coordinate for each letter, else add to Y
-        letters = [(x if direction == 'down' else x + i,
-                    y if direction == 'right' else y + i, word[i]) for i in range(len(word))]
-        new_letters = []
-
-        for x, y, c in letters:
-            if self.get_letter(x, y) is None:
-                new_letters.append((x, y, c))
-
-        old_words = list(w for w in self.get_words())
-
-        for x, y, c in new_letters:
-            self.add_letter(Letter(c, None, x, y))
-        new_words = list(w for w in self.get_words())
-
-        really_new_words = []
-        for w in new_words:
-            if w not in old_words:
-                really_new_words.append(w)
-
-        for x, y, c in new_letters:
-            self.board[y * self.width + x] = None
-
-        formula = self.score_with_bonus(letter_set, really_new_words)
-
-        return eval(formula)
-
-    def score_with_bonus(self, letter_set, really_new_words):
+    def score_word(self, letter_set, x, y, direction, word):
         '''
-        Calculate Bonus Score
+        Score placing word at (x, y) in direction without changing the board
+        :return: The total score and a list of (x, y, direction, word, score) for every word formed
         '''
-        board_bonus = {"m": "*2", "w2": "*2", "w3": "*3", "l2": "2", "l3": "3"}
-
-        start = really_new_words[0][0]
-        end = really_new_words[0][1]
-        formula = "("
-        word_multiplier = ""
-        word = really_new_words[0][3]
-
-        for i in range(len(word)):
-            if really_new_words[0][2] == "down":
-                bonus_tile = self.board_score.loc[start, end + i]
-            else:
-                bonus_tile = self.board_score.loc[start + i, end]
-
-            multiplier = str(board_bonus.get(bonus_tile, "1"))
-
-            if "w" in bonus_tile or "m" in bonus_tile:
-                multiplier = "1"
-                word_multiplier += board_bonus.get(bonus_tile)
-
-            formula += str(letter_set.get_score(word[i])) + "*" + multiplier
-
-            if i < len(word) - 1:
-                formula += ("+")
-            else:
-                formula += ")" + word_multiplier
-
-        return formula
+        tiles = [(x, y, c) for x, y, c in Move(x, y, direction, word) if self.get_letter(x, y) is None]
+        return score_tiles(self, letter_set, tiles)
@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+
+from .equity import rack_leaves
+from .lexicon import get_lexicon
+from .montecarlo import describe, restore
+from .player import Player
+from .state import GameState
+from .strategies import STATE_STRATEGIES, STRATEGIES
+
+
+def choose_position(strength, position, seed):
+    '''
+    Choose the move of the player to move on a described position (see montecarlo.describe)
+    in a worker process
+    '''
+    return STATE_STRATEGIES[strength](restore(position), seed)
+
+
+class ComputerPlayer(Player):
+    '''
+    A Player whose moves are chosen by one of the STRATEGIES ('greedy', 'equity',
+    'simulation' or 'montecarlo'). The search can run on a worker thread shared by all
+    computer players, or on a worker process for the strategies in STATE_STRATEGIES, so
+    several of them can think at once while the caller goes on. During the turns of other
+    players the leaves of the rack can be valued ahead.
+    '''
+    WORKERS = 4
+    executor = None
+    processes = None
+
+    def __init__(self, name, game, color=None, strength='greedy'):
+        '''
+        Construct a new ComputerPlayer
+        '''
+        super().__init__(name, game, color)
+        self.strength = strength
+        self.strategy = STRATEGIES[strength]
+
+    @classmethod
+    def threads(cls):
+        '''
+        Get the worker threads shared by all computer players
+        '''
+        if ComputerPlayer.executor is None:
+            ComputerPlayer.executor = ThreadPoolExecutor(max_workers=cls.WORKERS)
+        return ComputerPlayer.executor
+
+    def prepare(self):
+        '''
+        Value the leaves of the rack on a worker thread during the turns of other players, so
+        the equity of every Move is a lookup on the turn of the player. The rack only changes
+        on that turn, so the moves of the others do not make the values stale.
+        '''
+        if self.letters:
+            self.threads().submit(rack_leaves, self.letters)
+
+    def choose(self):
+        '''
+        Get the Move to play, the letters to exchange or None to pass
+        '''
+        return self.strategy(self.game, self)
+
+    def think(self):
+        '''
+        Start choosing the Move on a worker thread, or on a worker process for the strategies
+        in STATE_STRATEGIES
+        :return: A Future of the Move
+        '''
+        if self.strength not in STATE_STRATEGIES:
+            return self.threads().submit(self.choose)
+        if ComputerPlayer.processes is None:
+            # Forking while the worker threads run could copy a lock one of them holds into
+            # the child, which then waits for it forever
+            ComputerPlayer.processes = ProcessPoolExecutor(
+                self.WORKERS, mp_context=multiprocessing.get_context('spawn'), initializer=get_lexicon)
+        game = self.game
+        position = describe(GameState.from_game(game))
+        return ComputerPlayer.processes.submit(choose_position, self.strength, position,
+                                               '%i-%i' % (game.seed, game.turn))
+
+    def play(self, move):
+        '''
+        Play a Move chosen by choose, passing if it is None and exchanging if it is letters
+        '''
+        if move is None:
+            return self.pass_turn()
+        if isinstance(move, str):
+            return self.exchange_letters(move)
+        return self.place_word(move)
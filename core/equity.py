@@ -0,0 +1,98 @@
+from functools import lru_cache
+from itertools import combinations
+
+from .leaves import LEAVE_SIZE, get_leaves
+
+VOWELS = 'aeiou'
+
+# Rough value in points of keeping a letter on the rack for the next turn
+LEAVE_VALUES = {
+    'a': 1.0, 'b': -2.0, 'c': 0.5, 'd': 0.5, 'e': 2.5, 'f': -2.0, 'g': -1.5, 'h': 0.5,
+    'i': -0.5, 'j': -2.0, 'k': -1.5, 'l': 0.0, 'm': 0.0, 'n': 0.5, 'o': -1.0, 'p': -1.0,
+    'q': -7.0, 'r': 1.5, 's': 7.5, 't': 1.0, 'u': -3.0, 'v': -4.5, 'w': -3.0, 'x': 2.5,
+    'y': -0.5, 'z': 1.5,
+}
+
+
+def estimate_leave(leave):
+    '''
+    Estimate what the letters left on the rack are worth: the value of each letter, less a
+    penalty for duplicates and for too many vowels or consonants
+    '''
+    value = sum(LEAVE_VALUES[c] for c in leave)
+    value -= 3 * (len(leave) - len(set(leave)))
+    vowels = sum(c in VOWELS for c in leave)
+    value -= 2 * abs(2 * vowels - (len(leave) - vowels))
+    return value
+
+
+def leave_value(leave):
+    '''
+    What the letters left on the rack are worth, from the leave table fitted on self-play
+    games if one has been built (see core.leavegen), else estimated
+    '''
+    leaves = get_leaves()
+    if leaves is not None and len(leave) <= LEAVE_SIZE:
+        return leaves[leave]
+    return estimate_leave(leave)
+
+
+def remove_letters(rack, letters):
+    '''
+    Get rack without letters
+    '''
+    for c in letters:
+        pos = rack.find(c)
+        rack = rack[:pos] + rack[pos + 1:]
+    return rack
+
+
+def rack_leaves(rack):
+    '''
+    Get the value of every leave of rack of up to LEAVE_SIZE letters, keyed by its sorted
+    letters. Every Move and exchange leaves one of them, and they only change with the rack,
+    so they are cached per rack.
+    '''
+    return value_leaves(''.join(sorted(rack)), get_leaves())
+
+
+@lru_cache(maxsize=1024)
+def value_leaves(rack, leaves):
+    '''
+    Value every leave of the sorted rack with leaves (a LeaveTable or None for the estimate)
+    '''
+    value_of = leaves.__getitem__ if leaves is not None else estimate_leave
+    return {''.join(keep): value_of(keep)
+            for size in range(min(len(rack), LEAVE_SIZE) + 1)
+            for keep in sorted(set(combinations(rack, size)))}
+
+
+def best_exchange(rack):
+    '''
+    Find the letters of rack to exchange by trying every group of letters to keep
+    :return: The letters to exchange and the value of the letters kept
+    '''
+    best, value = '', None
+    for keep, keep_value in rack_leaves(rack).items():
+        if len(keep) < len(rack) and (value is None or keep_value > value):
+            best, value = keep, keep_value
+    return remove_letters(rack, best), value
+
+
+def rack_leave(rack, move):
+    '''
+    Get the letters of rack which are left after playing move
+    '''
+    return remove_letters(rack, (c for _, _, c in move.tiles))
+
+
+def equity(move, rack):
+    '''
+    The score of move plus the value of the letters it leaves on rack. Moves generated with
+    a leave table already know it.
+    '''
+    if move.equity is not None:
+        return move.equity
+    leave = ''.join(sorted(rack_leave(rack, move)))
+    values = rack_leaves(rack)
+    return move.score + (values[leave] if leave in values else leave_value(leave))
@@ -1,43 +1,92 @@
 from .board import Board
 from .letterset import LetterSet
 from .letter import Letter
+from .move import Move
+from .player import Player
+from .scoring import score_tiles
+from .validator import TOO_SHORT, MoveError, validate_tiles
 
-import numpy as np
+from random import Random
+
+class InvalidMove(Exception):
+    '''
+    Raised when a Move breaks the rules of the game. errors holds the MoveErrors found by
+    the validator, if any.
+    '''
+
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.errors = list(errors)
+
+class MoveEvent:
+    '''
+    The changes made by one turn, published to the listeners of a Game so they only need to
+    apply the difference instead of rescanning the board
+    '''
+
+    def __init__(self, player, kind, tiles=(), words=(), score=0, drawn='', returned=''):
+        '''
+        Construct a new MoveEvent. tiles are the (x, y, char) placed, words the
+        (x, y, direction, word, score) formed, drawn the letters taken from the bag and
+        returned the letters put back into it.
+        '''
+        self.player = player
+        self.kind = kind
+        self.tiles = list(tiles)
+        self.words = list(words)
+        self.score = score
+        self.drawn = drawn
+        self.returned = returned
+        self.rack = player.letters
+        self.remaining_letters = None
+        self.turn = None
 
 class Game:
     '''
-    A Game class which contains all information with regards to the Scrabble game
+    A Game class which contains all information with regards to the Scrabble game. It runs
+    without any user interface: players act through play, exchange and pass_turn.
     '''
     RUNNING = 'running'
     GAME_OVER = 'gameover'
 
-    def __init__(self, width, height, rack_size):
+    def __init__(self, width, height, rack_size, lexicon=None, seed=None):
         '''
-        Construct a new Game object
+        Construct a new Game object. Games with the same seed draw the same letters.
         '''
         self.width = width
         self.height = height
         self.rack_size = rack_size
-        self.board = Board(width, height)
-        self.letters = LetterSet()
+        # Without a seed one is picked, so every game can be recorded and replayed
+        self.seed = seed if seed is not None else Random().getrandbits(63)
+        self.random = Random(self.seed)
+        self.board = Board(width, height, lexicon)
+        self.letters = LetterSet(rng=self.random)
         self.players = []
         self.current_player = None
         self.moves = []
-        self.get_letters = self.letters.get_random_letters
+        self.get_letters = self.letters.draw
         self.lap = 0
         self.turn = 0
         self.empty = True
+        self.listeners = []
+
+        # Running totals kept up to date by every move
+        self.word_count = 0
+        self.tile_count = 0
 
     def get_state(self):
         '''
         Returns the state of the game
         '''
 
-        # Retrieve last 4 moves
-        last_moves = self.moves[-4:]
+        # The game also ends when every player passed twice in a row
+        last_moves = self.moves[-2 * len(self.players):]
 
         if (self.letters.remaining_letters == 0 and any(not p.letters for p in self.players)):
             return self.GAME_OVER
+        if self.players and len(last_moves) == 2 * len(self.players) and \
+                all(move[0] == Player.PASS for _, move in last_moves):
+            return self.GAME_OVER
         return self.RUNNING
 
     def add_player(self, player):
@@ -47,17 +96,33 @@ class Game:
         self.players.append(player)
 
         # Shuffle the order of play
-        np.random.shuffle(self.players)
+        self.random.shuffle(self.players)
 
 
     def set_next_player(self):
         '''
-        Set the next player
+        Set the next player and fill up their rack
         '''
         assert self.get_state() == self.RUNNING
         self.turn += 1
         self.lap = int((self.turn - 1) / len(self.players)) + 1
         self.current_player = self.players[(self.turn - 1) % len(self.players)]
+        self.current_player.update_letters()
+
+    def add_listener(self, listener):
+        '''
+        Call listener with the MoveEvent of every turn
+        '''
+        self.listeners.append(listener)
+
+    def publish(self, event):
+        '''
+        Send a MoveEvent to all listeners
+        '''
+        event.remaining_letters = self.letters.remaining_letters
+        event.turn = self.turn
+        for listener in self.listeners:
+            listener(event)
 
     def get_next_player(self):
         '''
@@ -65,22 +130,117 @@ class Game:
         '''
         return self.current_player
 
-    def add_word_by_current_player(self, player, x, y, direction, word):
+    def get_tiles(self, move):
+        '''
+        Get the (x, y, char) of the letters which move newly places on the board
+        '''
+        if move.tiles is not None:
+            return list(move.tiles)
+        tiles = []
+        for x, y, c in move:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise InvalidMove('The word does not fit on the board.')
+            letter = self.board.get_letter(x, y)
+            if letter is None:
+                tiles.append((x, y, c))
+            elif letter.char != c:
+                raise InvalidMove('The word does not match the letters on the board.')
+        return tiles
+
+    def check_move(self, player, tiles):
+        '''
+        Raise InvalidMove if placing tiles is not allowed for player
+        :return: The (x, y, direction, word) of every word formed
+        '''
+        rack = player.letters
+        for c in set(c for _, _, c in tiles):
+            if rack.count(c) < sum(1 for t in tiles if t[2] == c):
+                raise InvalidMove('The letter %s is not on the rack.' % c.upper())
+
+        words, errors = validate_tiles(self.board, tiles)
+        if errors:
+            raise InvalidMove(errors[0].message, errors)
+        return words
+
+    def play(self, move, validate=True):
         '''
-        Retrieve letters placed by current player and calculate score achieved. Remove letters that were used for
-        current player
+        The current player places move on the board. The move is validated (unless validate
+        is False, e.g. when replaying a recorded game) and scored, the letters are taken from
+        the rack and the rack is refilled.
+        :return: The score of the move
         '''
+        player = self.current_player
+        tiles = self.get_tiles(move)
+        if validate:
+            self.check_move(player, tiles)
+        score, words = score_tiles(self.board, self.letters, tiles)
+        if not words:
+            # Only possible without validation, e.g. a single letter with no neighbours
+            error = MoveError(TOO_SHORT, 'A word needs at least two letters.',
+                              [(x, y) for x, y, _ in tiles])
+            raise InvalidMove(error.message, [error])
+        self.count_words(tiles, words)
 
-        # Retrieve letters placed by current player
-        letters_placed_by_current_player = [(x if direction == 'down' else x + i, y if direction ==
-                    'right' else y + i, word[i]) for i in range(len(word))]
+        # Place the letters and remove them from the rack
+        for x, y, c in tiles:
+            self.board.add_letter(Letter(c, player, x, y))
+            pos = player.letters.index(c)
+            player.letters = player.letters[:pos] + player.letters[pos+1:]
+        self.empty = False
 
-        # Calculate score achieved by current player for letters placed
-        player.score += self.board.get_word_score(self.letters, x, y, direction, word)
+        player.score += score
+        drawn = player.update_letters()
+        self.publish(MoveEvent(player, Player.PLACE_WORD, tiles, words, score, drawn))
+        x, y, direction, word, _ = words[0]
+        player.played(Player.PLACE_WORD, x, y, direction, word, score)
+        return score
 
-        # Removed used letters for current player
-        for x, y, c in letters_placed_by_current_player:
-            if self.board.get_letter(x, y) is None:
-                self.board.add_letter(Letter(c, player, x, y))
-                pos = player.letters.index(c)
-                player.letters = player.letters[:pos] + player.letters[pos+1:]
+    def count_words(self, tiles, words):
+        '''
+        Update the running totals for tiles forming words. A formed word replaces the words
+        on the board it extends, which are its runs of two or more old letters.
+        '''
+        new = set((x, y) for x, y, _ in tiles)
+        for x, y, direction, word, _ in words:
+            run = 0
+            for px, py, _ in Move(x, y, direction, word):
+                if (px, py) in new:
+                    self.word_count -= run > 1
+                    run = 0
+                else:
+                    run += 1
+            self.word_count += 1 - (run > 1)
+        self.tile_count += len(tiles)
+
+    def exchange(self, letters):
+        '''
+        The current player swaps letters from their rack with new ones from the bag
+        '''
+        player = self.current_player
+        if self.rack_size > self.letters.remaining_letters:
+            self.publish(MoveEvent(player, Player.EXCHANGE_LETTERS))
+            return player.played(Player.EXCHANGE_LETTERS, '', '')
+
+        for c in set(letters):
+            if player.letters.count(c) < letters.count(c):
+                raise InvalidMove('The letter %s is not on the rack.' % c.upper())
+
+        # Draw before returning the letters, so the same letters cannot come back
+        new_letters = self.get_letters(len(letters))
+        self.letters.put_back(letters)
+
+        for c in letters:
+            pos = player.letters.find(c)
+            player.letters = player.letters[:pos] + player.letters[pos + 1:]
+
+        player.letters += new_letters
+
+        self.publish(MoveEvent(player, Player.EXCHANGE_LETTERS, drawn=new_letters, returned=letters))
+        player.played(Player.EXCHANGE_LETTERS, letters, new_letters)
+
+    def pass_turn(self):
+        '''
+        The current player passes
+        '''
+        self.publish(MoveEvent(self.current_player, Player.PASS))
+        self.current_player.played(Player.PASS, )
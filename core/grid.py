@@ -0,0 +1,98 @@
+import re
+
+EMPTY = 0
+
+# Runs of two or more letters in a line of the grid
+WORD_PATTERN = re.compile(rb'[a-z]{2,}')
+
+
+class Grid:
+    '''
+    A compact board representation. The tiles are stored as one byte per square (the ASCII
+    code of the letter, 0 if empty) next to the owner of each tile, and every row and column
+    keeps a bitmask of its occupied squares. Lines are read as byte slices and copying a
+    Grid is a buffer copy.
+    '''
+
+    def __init__(self, width, height):
+        '''
+        Construct a new empty Grid
+        '''
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height)
+        self.owners = bytearray(width * height)
+        self.rows = [0] * height
+        self.columns = [0] * width
+
+    def copy(self):
+        '''
+        Get an independent copy of the Grid
+        '''
+        grid = Grid.__new__(Grid)
+        grid.width = self.width
+        grid.height = self.height
+        grid.cells = self.cells[:]
+        grid.owners = self.owners[:]
+        grid.rows = self.rows[:]
+        grid.columns = self.columns[:]
+        return grid
+
+    def set(self, x, y, char, owner=0):
+        '''
+        Put the letter char owned by owner (a small integer) on the square at (x, y)
+        '''
+        self.cells[y * self.width + x] = ord(char)
+        self.owners[y * self.width + x] = owner
+        self.rows[y] |= 1 << x
+        self.columns[x] |= 1 << y
+
+    def clear(self, x, y):
+        '''
+        Empty the square at (x, y)
+        '''
+        self.cells[y * self.width + x] = EMPTY
+        self.owners[y * self.width + x] = 0
+        self.rows[y] &= ~(1 << x)
+        self.columns[x] &= ~(1 << y)
+
+    def get(self, x, y):
+        '''
+        Get the letter on the square at (x, y), or None if it is empty
+        '''
+        code = self.cells[y * self.width + x]
+        return chr(code) if code else None
+
+    def row(self, y):
+        '''
+        Get row y as bytes
+        '''
+        return bytes(self.cells[y * self.width:(y + 1) * self.width])
+
+    def column(self, x):
+        '''
+        Get column x as bytes
+        '''
+        return bytes(self.cells[x::self.width])
+
+    def transposed(self):
+        '''
+        Get the cells of the transposed grid (the columns one after another) as bytes
+        '''
+        return b''.join(self.cells[x::self.width] for x in range(self.width))
+
+    def get_words(self):
+        '''
+        Returns a generator which yields (x, y, direction, word) for all words on the grid
+        '''
+        for y, mask in enumerate(self.rows):
+            if mask & (mask >> 1):
+                for m in WORD_PATTERN.finditer(self.row(y)):
+                    yield (m.start(), y, 'right', m.group().decode())
+        for x, mask in enumerate(self.columns):
+            if mask & (mask >> 1):
+                for m in WORD_PATTERN.finditer(self.column(x)):
+                    yield (x, m.start(), 'down', m.group().decode())
+
+    def __len__(self):
+        return sum(bin(mask).count('1') for mask in self.rows)
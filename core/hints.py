@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+from .movegen import MoveGenerator
+
+
+class Hints:
+    '''
+    Finds the best Moves for a rack on a worker thread so the caller never waits for the
+    search. Each search has a time budget, after which the best Moves found so far are
+    used. Results are cached per board position and rack, unless the search ran out of time.
+    '''
+    CACHE_SIZE = 64
+
+    def __init__(self, board, letter_set, count=5, budget=1.0):
+        '''
+        Construct a new Hints for board. count is the number of Moves returned and budget
+        the number of seconds a search may take.
+        '''
+        self.board = board
+        self.letter_set = letter_set
+        self.count = count
+        self.budget = budget
+        self.cache = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def key(self, rack):
+        '''
+        Get the cache key of rack on the current board
+        '''
+        return bytes(self.board.grid.cells), ''.join(sorted(rack))
+
+    def request(self, rack):
+        '''
+        Start looking for the best Moves for rack on the current board
+        :return: A Future of the list of Moves, which is already done if they were cached
+        '''
+        key = self.key(rack)
+        if key in self.cache:
+            future, generator = self.cache[key]
+            # A search which ran out of time is tried again
+            if not future.done() or generator.complete:
+                self.cache.move_to_end(key)
+                return future
+            del self.cache[key]
+
+        # The search works on a copy, so the game may go on while it runs
+        generator = MoveGenerator(self.board.copy(), self.board.lexicon, self.letter_set)
+        future = self.executor.submit(self.search, generator, rack)
+        self.cache[key] = future, generator
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return future
+
+    def search(self, generator, rack):
+        '''
+        Run the search of generator for rack within the time budget
+        '''
+        return generator.generate(rack, monotonic() + self.budget)[:self.count]
+
+    def shutdown(self):
+        '''
+        Stop the worker thread, waiting for the running search
+        '''
+        self.executor.shutdown()
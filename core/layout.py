@@ -0,0 +1,49 @@
+from array import array
+from csv import reader
+import os
+
+# Absolute path of Board Multiplier CSV
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+BOARD_MULTIPLIER_PATH = os.path.join(BASE_DIR, 'data', 'board_multiplier.csv')
+
+# Letter and word multiplier of each Board Multiplier label
+LETTER_MULTIPLIERS = {'l2': 2, 'l3': 3}
+WORD_MULTIPLIERS = {'w2': 2, 'w3': 3, 'm': 2}
+
+# Layouts shared by the whole process, keyed by path
+_layouts = {}
+
+
+class BoardLayout:
+    '''
+    The premium squares of the board, parsed once into compact arrays indexed by
+    y * width + x. Row x of the Board Multiplier CSV holds the squares with that x.
+    '''
+
+    def __init__(self, filename=BOARD_MULTIPLIER_PATH):
+        '''
+        Construct a new BoardLayout from a Board Multiplier CSV
+        '''
+        with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+            rows = [[label.strip() for label in row] for row in reader(f) if row]
+
+        self.width = len(rows)
+        self.height = len(rows[0])
+        self.labels = [rows[i % self.width][i // self.width] for i in range(self.width * self.height)]
+        self.letter_multipliers = array('B', (LETTER_MULTIPLIERS.get(l, 1) for l in self.labels))
+        self.word_multipliers = array('B', (WORD_MULTIPLIERS.get(l, 1) for l in self.labels))
+
+    def get_label(self, x, y):
+        '''
+        Get the Board Multiplier label of the square at (x, y)
+        '''
+        return self.labels[y * self.width + x]
+
+
+def get_layout(filename=BOARD_MULTIPLIER_PATH):
+    '''
+    Get the BoardLayout for filename which is shared by the whole process
+    '''
+    if filename not in _layouts:
+        _layouts[filename] = BoardLayout(filename)
+    return _layouts[filename]
@@ -0,0 +1,154 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
+
+import numpy as np
+
+from .computer import ComputerPlayer
+from .equity import VOWELS
+from .game import Game
+from .leaves import DEFAULT_LEAVES_PATH, LEAVE_SIZE, TABLE_SIZE, LeaveTable, iter_leaves, \
+    leave_index
+from .lexicon import ALPHABET, get_lexicon
+from .player import Player
+from .simulation import init_worker
+
+# Weight of the fitted model against the mean next turn score of a leave, in samples. Rare
+# leaves take their value mostly from the model, common ones from their own games.
+PRIOR_SAMPLES = 20
+
+# Leaves whose features are built at once
+CHUNK_SIZE = 50000
+
+
+def play_leaves(seed, players=2, strategy='greedy', rack_size=7):
+    '''
+    Play one game between bots and collect a sample for every leave of up to LEAVE_SIZE
+    letters kept with a full bag: the leave_index and the score of the next turn of the
+    player who kept it
+    :return: The indexes and the scores as arrays
+    '''
+    game = Game(15, 15, rack_size, lexicon=get_lexicon(), seed=seed)
+    for i in range(players):
+        game.add_player(ComputerPlayer('Bot %i' % (i + 1), game, color='#000000', strength=strategy))
+
+    kept = {}
+    indexes, scores = array('I'), array('H')
+
+    def moveMade(event):
+        player = event.player
+        if player in kept:
+            indexes.append(kept.pop(player))
+            scores.append(event.score if event.kind == Player.PLACE_WORD else 0)
+        # The rest of the rack was refilled, so the leave is all that was not drawn
+        if event.kind != Player.PASS and len(event.rack) == rack_size:
+            leave = event.rack[:len(event.rack) - len(event.drawn)]
+            if len(leave) <= LEAVE_SIZE:
+                kept[player] = leave_index(leave)
+
+    game.add_listener(moveMade)
+    while game.get_state() == game.RUNNING:
+        game.set_next_player()
+        player = game.current_player
+        player.play(player.choose())
+    return indexes, scores
+
+
+def features(leaves):
+    '''
+    Get the features of leaves for the fitted model: the count of each letter, the
+    duplicates of each letter, the vowel/consonant balance and the size
+    '''
+    x = np.zeros((len(leaves), 2 * len(ALPHABET) + 1 + LEAVE_SIZE + 1))
+    balance = 2 * len(ALPHABET)
+    for row, leave in enumerate(leaves):
+        for c in set(leave):
+            count = leave.count(c)
+            x[row, ALPHABET.index(c)] = count
+            x[row, len(ALPHABET) + ALPHABET.index(c)] = count - 1
+        vowels = sum(c in VOWELS for c in leave)
+        x[row, balance] = abs(2 * vowels - (len(leave) - vowels))
+        x[row, balance + 1 + len(leave)] = 1
+    return x
+
+
+def fit(indexes, scores, prior_samples=PRIOR_SAMPLES):
+    '''
+    Fit the value of every leave from self-play samples: how much more than average the
+    next turn scores with it. A least squares model of letter, duplicate, balance and size
+    effects fills in for the leaves seen rarely or never.
+    :return: The values of all TABLE_SIZE leaves in leave_index order
+    '''
+    indexes = np.asarray(indexes, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+    target = scores - scores.mean()
+    counts = np.bincount(indexes, minlength=TABLE_SIZE)
+    sums = np.bincount(indexes, weights=target, minlength=TABLE_SIZE)
+
+    leaves = [None] * TABLE_SIZE
+    for leave in iter_leaves():
+        leaves[leave_index(leave)] = leave
+
+    # Weighted least squares on the mean of every leave seen, through the normal equations
+    # so the features are only built a chunk at a time
+    seen = np.flatnonzero(counts)
+    a = b = 0
+    for start in range(0, len(seen), CHUNK_SIZE):
+        chunk = seen[start:start + CHUNK_SIZE]
+        x = features([leaves[i] for i in chunk])
+        a = a + x.T @ (x * counts[chunk, None])
+        b = b + x.T @ sums[chunk]
+    coefficients = np.linalg.lstsq(a, b, rcond=None)[0]
+
+    model = np.concatenate([features(leaves[start:start + CHUNK_SIZE]) @ coefficients
+                            for start in range(0, TABLE_SIZE, CHUNK_SIZE)])
+    values = (sums + prior_samples * model) / (counts + prior_samples)
+    # Keeping nothing is the baseline of the exchange decisions
+    return values - values[leave_index('')]
+
+
+def build(games, seed=0, workers=None, filename=DEFAULT_LEAVES_PATH, **kwargs):
+    '''
+    Play games self-play games on a pool of worker processes, fit the leave values and save
+    the LeaveTable to filename. Further keyword arguments go to play_leaves.
+    '''
+    workers = workers or os.cpu_count() or 1
+    get_lexicon()
+    seeds = range(seed, seed + games)
+    indexes, scores = array('I'), array('H')
+    with ProcessPoolExecutor(workers, initializer=init_worker) as executor:
+        chunksize = max(1, games // (workers * 4))
+        for game_indexes, game_scores in executor.map(partial(play_leaves, **kwargs), seeds,
+                                                      chunksize=chunksize):
+            indexes.extend(game_indexes)
+            scores.extend(game_scores)
+
+    table = LeaveTable(array('f', fit(indexes, scores)), len(indexes))
+    table.save(filename)
+    return table
+
+
+def main(args=None):
+    '''
+    Build the leave table from self-play games
+    '''
+    import argparse
+    from .strategies import STRATEGIES
+
+    parser = argparse.ArgumentParser(prog='python -m core.leavegen', description=main.__doc__.strip())
+    parser.add_argument('-n', '--games', type=int, default=10000, help='number of games')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('-p', '--players', type=int, default=2, help='players per game')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='greedy')
+    parser.add_argument('-w', '--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('-o', '--output', default=DEFAULT_LEAVES_PATH, help='leave table file')
+    args = parser.parse_args(args)
+
+    table = build(args.games, args.seed, args.workers, args.output, players=args.players,
+                  strategy=args.strategy)
+    print('%i leaves fitted from %i samples' % (len(table), table.samples))
+
+
+if __name__ == '__main__':
+    main()
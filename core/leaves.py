@@ -0,0 +1,162 @@
+from array import array
+from math import comb
+from threading import Lock
+from time import monotonic
+import mmap
+import os
+import struct
+import sys
+
+from .lexicon import ALPHABET
+
+# Absolute path of the leave table
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_LEAVES_PATH = os.path.join(BASE_DIR, 'data', 'leaves.bin')
+
+# Largest leave in the table. A leave is padded with blanks to LEAVE_SIZE symbols, so the
+# table holds one entry for every multiset of LEAVE_SIZE symbols out of the blank and the
+# letters.
+LEAVE_SIZE = 6
+SYMBOLS = {c: i + 1 for i, c in enumerate(ALPHABET)}
+TABLE_SIZE = comb(len(SYMBOLS) + LEAVE_SIZE, LEAVE_SIZE)
+
+# For the i-th symbol s of a padded sorted leave the term C(s + i, i + 1) of its rank in
+# the combinatorial number system
+RANKS = [[comb(s + i, i + 1) for s in range(len(SYMBOLS) + 1)] for i in range(LEAVE_SIZE)]
+
+# Leave table file: magic, number of entries and number of self-play samples fitted,
+# followed by the values as little endian float32
+LEAVES_MAGIC = b'SCRBLVE1'
+LEAVES_HEADER = struct.Struct('<8sII')
+
+# Leave tables shared by the whole process, keyed by path, and for the paths which held no
+# table their file_state and when it was taken. A missing table is looked for again at most
+# every RECHECK_INTERVAL seconds.
+_tables = {}
+_missing = {}
+_tables_lock = Lock()
+RECHECK_INTERVAL = 1.0
+
+
+def leave_index(leave):
+    '''
+    Get the position of a leave (a string of at most LEAVE_SIZE letters) in the table. The
+    index is a perfect hash of the sorted letters.
+    '''
+    i = LEAVE_SIZE - len(leave)
+    index = 0
+    for c in sorted(leave):
+        index += RANKS[i][SYMBOLS[c]]
+        i += 1
+    return index
+
+
+def iter_leaves(size=LEAVE_SIZE):
+    '''
+    Yields every sorted leave of up to size letters
+    '''
+    def extend(leave, first):
+        yield leave
+        if len(leave) < size:
+            for i in range(first, len(ALPHABET)):
+                yield from extend(leave + ALPHABET[i], i)
+    return extend('', 0)
+
+
+class LeaveTable:
+    '''
+    The value in points of every leave of up to LEAVE_SIZE letters, stored as one float per
+    leave at its leave_index. A lookup is a single array read.
+    '''
+
+    def __init__(self, values, samples=0):
+        '''
+        Construct a new LeaveTable from TABLE_SIZE values
+        '''
+        self.values = values
+        self.samples = samples
+        self._mmap = None
+
+    @classmethod
+    def open(cls, filename=DEFAULT_LEAVES_PATH):
+        '''
+        Memory-map a leave table file
+        '''
+        with open(filename, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, samples = LEAVES_HEADER.unpack_from(mm)
+        if magic != LEAVES_MAGIC or size != TABLE_SIZE or len(mm) != LEAVES_HEADER.size + 4 * size:
+            mm.close()
+            raise ValueError('%s is not a leave table' % filename)
+
+        if sys.byteorder == 'little':
+            values = memoryview(mm)[LEAVES_HEADER.size:].cast('f')
+        else:
+            values = array('f', mm[LEAVES_HEADER.size:])
+            values.byteswap()
+        table = cls(values, samples)
+        table._mmap = mm
+        return table
+
+    def save(self, filename=DEFAULT_LEAVES_PATH):
+        '''
+        Write the table to a file, replacing it atomically
+        '''
+        tmp = '%s.%i.tmp' % (filename, os.getpid())
+        values = array('f', self.values)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        with open(tmp, 'wb') as f:
+            f.write(LEAVES_HEADER.pack(LEAVES_MAGIC, len(values), self.samples))
+            values.tofile(f)
+        os.replace(tmp, filename)
+        # A table of the file opened before is out of date now
+        with _tables_lock:
+            _tables.pop(filename, None)
+            _missing.pop(filename, None)
+
+    def __getitem__(self, leave):
+        return self.values[leave_index(leave)]
+
+    def __len__(self):
+        return len(self.values)
+
+
+def file_state(filename):
+    '''
+    Get the modification time and size of a file, or None if it does not exist
+    '''
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_leaves(filename=DEFAULT_LEAVES_PATH):
+    '''
+    Get the LeaveTable at filename which is shared by the whole process, or None if no table
+    has been built. A missing table is only opened again once the file has changed.
+    '''
+    table = _tables.get(filename)
+    if table is not None:
+        return table
+    missing = _missing.get(filename)
+    if missing is not None:
+        state, checked = missing
+        now = monotonic()
+        if now - checked < RECHECK_INTERVAL:
+            return None
+        if file_state(filename) == state:
+            _missing[filename] = state, now
+            return None
+    with _tables_lock:
+        if filename not in _tables:
+            state = file_state(filename)
+            try:
+                _tables[filename] = LeaveTable.open(filename)
+            except (OSError, ValueError, struct.error):
+                _missing[filename] = state, monotonic()
+                return None
+            _missing.pop(filename, None)
+        return _tables[filename]
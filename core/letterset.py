@@ -1,5 +1,5 @@
 from csv import reader
-from random import seed, randrange
+from random import Random
 import os
 
 # Absolute path of Letters CSV
@@ -8,14 +8,21 @@ DEFAULT_LETTERSET = os.path.join(BASE_DIR, 'data', 'letters.csv')
 
 class LetterSet:
     '''
-    A class to store information about the letter chips in the game like score and count.
+    A class to store information about the letter chips in the game like score and count. The chips
+    left in the bag are also kept in a list, so a random one is drawn in constant time by swapping
+    it with the last chip and popping it. slots holds the positions in the bag of each letter, so
+    a given letter is taken out the same way.
     '''
 
-    def __init__(self, filename=DEFAULT_LETTERSET):
+    def __init__(self, filename=DEFAULT_LETTERSET, rng=None):
         '''
-        Construct a new LetterSet while loading the initial state from a csv file specified by filename
+        Construct a new LetterSet while loading the initial state from a csv file specified by filename.
+        Letters are drawn with rng, a random.Random instance.
         '''
+        self.random = rng if rng is not None else Random()
         self.letters = {}
+        self.bag = []
+        self.slots = {}
         self.remaining_letters = 0
         if filename is not None:
             self.load_file(filename)
@@ -27,7 +34,9 @@ class LetterSet:
         with open(filename, 'r', newline='', encoding='utf-8') as f:
             for row in reader(f):
                 self.letters[row[0]] = [int(row[1]), int(row[2])]
-                self.remaining_letters += int(row[2])
+                self.slots[row[0]] = set()
+                for _ in range(int(row[2])):
+                    self.add(row[0])
 
     def __iter__(self):
         '''
@@ -53,14 +62,38 @@ class LetterSet:
         Increase the amount of available copies for a particular Letter
         '''
         self.letters[str(letter)][1] += 1
-        self.remaining_letters += 1
+        self.add(str(letter))
 
     def decrease_count(self, letter):
         '''
         Decrease the amount of available copies for a particular Letter
         '''
         self.letters[str(letter)][1] -= 1
+        self.remove(next(iter(self.slots[str(letter)])))
+
+    def add(self, c):
+        '''
+        Put a chip at the end of the bag
+        '''
+        self.slots[c].add(len(self.bag))
+        self.bag.append(c)
+        self.remaining_letters += 1
+
+    def remove(self, p):
+        '''
+        Take the chip at position p out of the bag by moving the last chip into its place
+        '''
+        bag, slots = self.bag, self.slots
+        c, last = bag[p], len(bag) - 1
+        slots[c].remove(p)
+        if p != last:
+            moved = bag[last]
+            bag[p] = moved
+            slots[moved].remove(last)
+            slots[moved].add(p)
+        bag.pop()
         self.remaining_letters -= 1
+        return c
 
     def is_available(self, letter):
         '''
@@ -68,16 +101,42 @@ class LetterSet:
         '''
         return str(letter) in self.letters and self.get_count(letter) > 0
 
-    def get_random_letters(self, count, msg=None):
-        '''
-        Retrieve count number of random letters from LetterSet
-        '''
-        seed()
-        count = min(count, self.remaining_letters)
-        random_letters = ''
-        available = ''.join(k * v[1] for k, v in self.letters.items() if v[1] > 0)
-        while len(random_letters) < count:
-            p = randrange(0, len(available))
-            random_letters = random_letters + available[p]
-            available = available[:p] + available[p + 1:]
-        return random_letters
+    def draw(self, count):
+        '''
+        Take count random letters (or as many as are left) out of the bag
+        '''
+        bag, slots, counts = self.bag, self.slots, self.letters
+        letters = ''
+        for _ in range(min(count, len(bag))):
+            # remove, inlined as this runs for every letter drawn
+            p = self.random.randrange(len(bag))
+            c, last = bag[p], len(bag) - 1
+            slots[c].remove(p)
+            if p != last:
+                moved = bag[p] = bag[last]
+                slots[moved].remove(last)
+                slots[moved].add(p)
+            bag.pop()
+            counts[c][1] -= 1
+            letters += c
+        self.remaining_letters -= len(letters)
+        return letters
+
+    def take(self, letters):
+        '''
+        Take the given letters out of the bag, e.g. to replay recorded draws
+        '''
+        for c in letters:
+            self.decrease_count(c)
+        return letters
+
+    def put_back(self, letters):
+        '''
+        Return letters to the bag
+        '''
+        bag, slots, counts = self.bag, self.slots, self.letters
+        for c in letters:
+            counts[c][1] += 1
+            slots[c].add(len(bag))
+            bag.append(c)
+        self.remaining_letters += len(letters)
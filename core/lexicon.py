@@ -0,0 +1,349 @@
+from array import array
+from csv import reader
+from hashlib import sha256
+from threading import Lock
+import mmap
+import os
+import struct
+import sys
+
+# Absolute path of Words CSV
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_WORDS_PATH = os.path.join(BASE_DIR, 'data', 'words.csv')
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+LETTER_BITS = {c: 1 << i for i, c in enumerate(ALPHABET)}
+TERMINAL = 1 << 26
+ALL_LETTERS = TERMINAL - 1
+
+# Compiled lexicon file: magic, SHA-256 of the source word list, number of nodes, edges and
+# words, followed by the mask, first edge and edge target arrays as little endian uint32
+LEXICON_MAGIC = b'SCRBLEX1'
+LEXICON_HEADER = struct.Struct('<8s32sIII')
+
+# Lexicons shared by the whole process, keyed by source path
+_lexicons = {}
+_lexicons_lock = Lock()
+
+
+class _Node:
+    '''
+    Temporary trie node used while building a Lexicon
+    '''
+    __slots__ = ('children', 'final')
+
+    def __init__(self):
+        self.children = {}
+        self.final = False
+
+    def key(self):
+        '''
+        Nodes with equal keys accept the same suffixes and can be merged
+        '''
+        return (self.final, tuple((c, id(n)) for c, n in self.children.items()))
+
+
+def build_dawg(words):
+    '''
+    Build a minimised trie (DAWG) from a sorted iterable of unique words and flatten it into
+    three arrays: a child mask and a first edge index per node, and the edge targets. The
+    children of a node are stored in alphabetical order, so the child for a letter is found
+    by counting the mask bits below it. Node 0 is the root.
+    '''
+    root = _Node()
+    register = {}
+    unchecked = []
+    previous = ''
+
+    def minimize(down_to):
+        while len(unchecked) > down_to:
+            parent, c, child = unchecked.pop()
+            key = child.key()
+            if key in register:
+                parent.children[c] = register[key]
+            else:
+                register[key] = child
+
+    for word in words:
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        minimize(common)
+
+        node = unchecked[-1][2] if unchecked else root
+        for c in word[common:]:
+            child = _Node()
+            node.children[c] = child
+            unchecked.append((node, c, child))
+            node = child
+        node.final = True
+        previous = word
+    minimize(0)
+
+    # Flatten breadth first so that the root gets index 0
+    masks, firsts, edges = array('I'), array('I'), array('I')
+    index = {id(root): 0}
+    order = [root]
+    for node in order:
+        mask = TERMINAL if node.final else 0
+        firsts.append(len(edges))
+        for c, child in node.children.items():
+            mask |= LETTER_BITS[c]
+            if id(child) not in index:
+                index[id(child)] = len(order)
+                order.append(child)
+            edges.append(index[id(child)])
+        masks.append(mask)
+
+    return masks, firsts, edges
+
+
+def read_words(filename):
+    '''
+    Read a word list (csv or plain text with one word in the first column of each row,
+    optionally gzip compressed) and return the valid words
+    '''
+    # Imported here to keep it out of the startup path
+    import gzip
+
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(filename, 'rt', newline='', encoding='utf-8-sig') as f:
+        for row in reader(f):
+            if row:
+                word = row[0].strip().lower()
+                if word and all(c in LETTER_BITS for c in word):
+                    yield word
+
+
+def source_digest(filename):
+    '''
+    Get the SHA-256 digest of a word list file
+    '''
+    digest = sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def compiled_path(filename):
+    '''
+    Get the path of the compiled lexicon belonging to a word list
+    '''
+    if filename.endswith('.gz'):
+        filename = filename[:-3]
+    return os.path.splitext(filename)[0] + '.lex'
+
+
+class Lexicon:
+    '''
+    The list of playable words stored as a compact minimised trie (DAWG). Membership and
+    prefix queries both walk the trie in O(word length). The arrays are either built in
+    memory or memory-mapped from a compiled lexicon file, so processes opening the same
+    file share its pages.
+    '''
+    ROOT = 0
+
+    def __init__(self, masks, firsts, edges, size, digest=None):
+        '''
+        Construct a new Lexicon from flattened trie arrays (see build_dawg)
+        '''
+        self.masks = masks
+        self.firsts = firsts
+        self.edges = edges
+        self.size = size
+        self.digest = digest
+        self._mmap = None
+
+    @classmethod
+    def from_words(cls, words, digest=None):
+        '''
+        Build a Lexicon from an iterable of lowercase words, dropping duplicates
+        '''
+        words = sorted(set(words))
+        return cls(*build_dawg(words), len(words), digest)
+
+    @classmethod
+    def open(cls, filename):
+        '''
+        Memory-map a compiled lexicon file
+        '''
+        with open(filename, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, digest, nodes, edges, size = LEXICON_HEADER.unpack_from(mm)
+        if magic != LEXICON_MAGIC or len(mm) != LEXICON_HEADER.size + 4 * (2 * nodes + edges):
+            mm.close()
+            raise ValueError('%s is not a compiled lexicon' % filename)
+
+        arrays = []
+        offset = LEXICON_HEADER.size
+        for count in (nodes, nodes, edges):
+            if sys.byteorder == 'little':
+                arrays.append(memoryview(mm)[offset:offset + 4 * count].cast('I'))
+            else:
+                values = array('I', mm[offset:offset + 4 * count])
+                values.byteswap()
+                arrays.append(values)
+            offset += 4 * count
+
+        lexicon = cls(*arrays, size, digest)
+        lexicon._mmap = mm
+        return lexicon
+
+    @classmethod
+    def load(cls, filename=DEFAULT_WORDS_PATH):
+        '''
+        Load the Lexicon for a word list through its compiled lexicon file, which is
+        (re)built whenever it is missing or the word list has changed
+        '''
+        path = compiled_path(filename)
+        if not os.path.exists(filename):
+            return cls.open(path)
+
+        digest = source_digest(filename)
+        try:
+            lexicon = cls.open(path)
+            if lexicon.digest == digest:
+                return lexicon
+        except (OSError, ValueError, struct.error):
+            pass
+
+        lexicon = cls.from_words(read_words(filename), digest)
+        try:
+            lexicon.save(path)
+        except OSError:
+            return lexicon
+        return cls.open(path)
+
+    def save(self, filename):
+        '''
+        Write the Lexicon to a compiled lexicon file. The file is replaced atomically so
+        processes which still map the old file are not affected.
+        '''
+        tmp = '%s.%i.tmp' % (filename, os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(LEXICON_HEADER.pack(LEXICON_MAGIC, self.digest or bytes(32), len(self.masks),
+                                        len(self.edges), self.size))
+            for values in (self.masks, self.firsts, self.edges):
+                values = array('I', values)
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                values.tofile(f)
+        os.replace(tmp, filename)
+
+    def __contains__(self, word):
+        node = self.walk(word)
+        return node is not None and self.is_terminal(node)
+
+    def __len__(self):
+        return self.size
+
+    def contains_all(self, words):
+        '''
+        Check if every word of an iterable is in the Lexicon
+        '''
+        return all(word in self for word in words)
+
+    def unknown(self, words):
+        '''
+        Get the words of an iterable which are not in the Lexicon, each listed once in the
+        order they first appear
+        '''
+        return [word for word in dict.fromkeys(words) if word not in self]
+
+    def child(self, node, char):
+        '''
+        Get the node reached from node by char, or None if no word continues that way
+        '''
+        bit = LETTER_BITS.get(char)
+        mask = self.masks[node]
+        if bit is None or not mask & bit:
+            return None
+        return self.edges[self.firsts[node] + bin(mask & (bit - 1)).count('1')]
+
+    def children(self, node):
+        '''
+        Yields (char, node) for every letter that continues a word from node
+        '''
+        mask = self.masks[node]
+        i = self.firsts[node]
+        for c in ALPHABET:
+            if mask & LETTER_BITS[c]:
+                yield c, self.edges[i]
+                i += 1
+
+    def child_mask(self, node):
+        '''
+        Get a 26 bit mask of the letters that continue a word from node
+        '''
+        return self.masks[node] & ALL_LETTERS
+
+    def is_terminal(self, node):
+        '''
+        Check if the path to node spells a complete word
+        '''
+        return bool(self.masks[node] & TERMINAL)
+
+    def walk(self, prefix, node=ROOT):
+        '''
+        Follow prefix from node and return the node reached, or None
+        '''
+        for c in prefix:
+            node = self.child(node, c)
+            if node is None:
+                return None
+        return node
+
+    def cross_check(self, before, after):
+        '''
+        Get a 26 bit mask of the letters c for which before + c + after is a word
+        '''
+        mask = 0
+        node = self.walk(before)
+        if node is not None:
+            for c, child in self.children(node):
+                end = self.walk(after, child)
+                if end is not None and self.masks[end] & TERMINAL:
+                    mask |= LETTER_BITS[c]
+        return mask
+
+    def is_prefix(self, prefix):
+        '''
+        Check if any word starts with prefix
+        '''
+        return self.walk(prefix) is not None
+
+
+def get_lexicon(filename=DEFAULT_WORDS_PATH):
+    '''
+    Get the Lexicon for filename which is shared by the whole process
+    '''
+    with _lexicons_lock:
+        if filename not in _lexicons:
+            _lexicons[filename] = Lexicon.load(filename)
+        return _lexicons[filename]
+
+
+def main(args=None):
+    '''
+    Compile a word list into a lexicon file
+    '''
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m core.lexicon', description=main.__doc__.strip())
+    parser.add_argument('source', nargs='?', default=DEFAULT_WORDS_PATH,
+                        help='word list (.csv or .txt, optionally .gz)')
+    parser.add_argument('-o', '--output', help='compiled lexicon file (default: next to the source)')
+    args = parser.parse_args(args)
+
+    lexicon = Lexicon.from_words(read_words(args.source), source_digest(args.source))
+    output = args.output or compiled_path(args.source)
+    lexicon.save(output)
+    print('%s: %i words, %i nodes, %i edges' % (output, len(lexicon), len(lexicon.masks),
+                                                len(lexicon.edges)))
+
+
+if __name__ == '__main__':
+    main()
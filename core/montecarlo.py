@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from random import Random
+import os
+
+from .board import Board
+from .equity import equity, leave_value, rack_leave
+from .letter import Letter
+from .letterset import LetterSet
+from .leaves import get_leaves
+from .lexicon import get_lexicon
+from .move import Move
+from .movegen import MoveGenerator
+from .state import GameState
+
+# The last positions restored in a worker process, keyed by their description
+_states = OrderedDict()
+STATES_SIZE = 4
+
+
+def describe(state):
+    '''
+    Get a small picklable description of a GameState for the worker processes
+    '''
+    board = state.board
+    return (board.width, board.height, bytes(board.grid.cells), state.racks, state.scores,
+            state.bag, state.player, state.rack_size, state.passes)
+
+
+def restore(position):
+    '''
+    Get the GameState of a description made by describe, built once per process while it
+    is one of the STATES_SIZE positions used last
+    '''
+    if position in _states:
+        _states.move_to_end(position)
+    else:
+        width, height, cells, racks, scores, bag, player, rack_size, passes = position
+        board = Board(width, height, get_lexicon())
+        for i, code in enumerate(cells):
+            if code:
+                board.add_letter(Letter(chr(code), None, i % width, i // width))
+        _states[position] = GameState(board, LetterSet(), range(len(racks)), racks, scores, bag,
+                                      player, rack_size, passes)
+        if len(_states) > STATES_SIZE:
+            _states.popitem(last=False)
+    return _states[position]
+
+
+def simulate(state, tiles, iterations, plies, seed):
+    '''
+    Play the move placing tiles on state iterations times, each time against opponent racks
+    drawn from the letters its player cannot see, followed by plies turns of greedy play
+    :return: The equity of every iteration: the points scored less the points of the best
+             opponent, plus the value of the letters the move leaves on the rack
+    '''
+    rng = Random(seed)
+    me = state.player
+    lexicon = state.board.lexicon
+    others = [p for p in range(len(state.racks)) if p != me]
+    unseen = list(state.bag + ''.join(state.racks[p] for p in others))
+    racks, scores, bag = state.racks, state.scores, state.bag
+    move = Move(tiles[0][0], tiles[0][1], None, None, tiles)
+    # The leave is known before the rack is refilled and the same for every iteration
+    leave = leave_value(rack_leave(racks[me], move))
+
+    values = []
+    for _ in range(iterations):
+        # Deal the unseen letters again: opponent racks first, the rest is the bag
+        rng.shuffle(unseen)
+        dealt, pos = list(racks), 0
+        for p in others:
+            dealt[p] = ''.join(unseen[pos:pos + len(racks[p])])
+            pos += len(racks[p])
+        state.racks, state.bag = tuple(dealt), ''.join(unseen[pos:])
+
+        state.apply(move)
+        turns = 1
+        for _ in range(plies):
+            if state.is_over():
+                break
+            moves = MoveGenerator(state.board, lexicon, state.letter_set).generate(state.rack)
+            if moves:
+                state.apply(moves[0])
+            else:
+                state.pass_turn()
+            turns += 1
+
+        gain = [state.scores[p] - scores[p] for p in range(len(scores))]
+        value = gain[me] - max((gain[p] for p in others), default=0)
+        if not state.is_over():
+            value += leave
+        values.append(value)
+
+        for _ in range(turns):
+            state.undo()
+    state.racks, state.bag = racks, bag
+    return values
+
+
+def simulate_position(position, tiles, iterations, plies, seed):
+    '''
+    Run simulate in a worker process on a described position
+    '''
+    return simulate(restore(position), tiles, iterations, plies, seed)
+
+
+class Candidate:
+    '''
+    A candidate Move and the equities found by simulating it
+    '''
+
+    def __init__(self, move):
+        '''
+        Construct a new Candidate
+        '''
+        self.move = move
+        self.values = []
+
+    def add(self, values):
+        '''
+        Add the equities of more iterations
+        '''
+        self.values.extend(values)
+
+    @property
+    def mean(self):
+        return sum(self.values) / len(self.values) if self.values else 0
+
+    def interval(self, z=1.96):
+        '''
+        Get the confidence interval of the mean equity, z standard errors wide on each side
+        '''
+        n = len(self.values)
+        if n < 2:
+            return float('-inf'), float('inf')
+        mean = self.mean
+        error = z * sqrt(sum((v - mean) ** 2 for v in self.values) / (n - 1) / n)
+        return mean - error, mean + error
+
+    def __repr__(self):
+        low, high = self.interval()
+        return 'Candidate(%r, mean=%.1f, interval=(%.1f, %.1f), n=%i)' % (
+            self.move, self.mean, low, high, len(self.values))
+
+
+def evaluate(state, candidates=10, plies=2, batch=16, iterations=256, workers=None, seed=None,
+             z=1.96):
+    '''
+    Rank the candidates Moves with the highest equity for the player to move on state by
+    simulating them. Every round each candidate which may still be the best is simulated
+    batch more times, spread over a pool of worker processes. The search stops once the
+    confidence interval of the leader is above all others, or after iterations per
+    candidate.
+    :return: The Candidates sorted by descending mean equity
+    '''
+    rack = state.rack
+    moves = MoveGenerator(state.board, state.board.lexicon, state.letter_set, get_leaves()).generate(rack)
+    moves = sorted(moves, key=lambda m: equity(m, rack), reverse=True)[:candidates]
+    ranked = [Candidate(m) for m in moves]
+    if len(ranked) < 2:
+        return ranked
+
+    # Candidates simulated in this process change a clone, which copies the board once
+    local = state.clone()
+    rng = Random(seed)
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(workers, initializer=get_lexicon) if workers > 1 else None
+    position = describe(state) if executor else None
+    try:
+        active = list(ranked)
+        while len(active) > 1 and len(active[0].values) < iterations:
+            seeds = [rng.getrandbits(32) for _ in active]
+            if executor:
+                futures = [executor.submit(simulate_position, position, c.move.tiles, batch, plies, s)
+                           for c, s in zip(active, seeds)]
+                for c, future in zip(active, futures):
+                    c.add(future.result())
+            else:
+                for c, s in zip(active, seeds):
+                    c.add(simulate(local, c.move.tiles, batch, plies, s))
+
+            # Drop the candidates which are clearly worse than the leader
+            leader = max(active, key=lambda c: c.mean)
+            low = leader.interval(z)[0]
+            active = [c for c in active if c is leader or c.interval(z)[1] >= low]
+            active.sort(key=lambda c: c is not leader)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return sorted(ranked, key=lambda c: c.mean, reverse=True)
@@ -0,0 +1,41 @@
+class Move:
+    '''
+    A Move class representing a word placed on the board
+    '''
+
+    def __init__(self, x, y, direction, word, tiles=None, score=None, equity=None):
+        '''
+        Construct a new Move. tiles lists the (x, y, char) of the letters which are newly
+        placed, the other letters of word are already on the board. equity is the score plus
+        the value of the letters left on the rack, if known.
+        '''
+        self.x = x
+        self.y = y
+        self.direction = direction
+        self.word = word
+        self.tiles = tiles
+        self.score = score
+        self.equity = equity
+
+    def __iter__(self):
+        '''
+        Yields (x, y, char) for every letter of the word
+        '''
+        for i, c in enumerate(self.word):
+            yield (self.x if self.direction == 'down' else self.x + i,
+                   self.y if self.direction == 'right' else self.y + i, c)
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return 'Move(%i, %i, %r, %r, score=%r)' % (self.x, self.y, self.direction, self.word, self.score)
+
+    def key(self):
+        '''
+        Get a tuple identifying the Move
+        '''
+        return (self.x, self.y, self.direction, self.word)
@@ -0,0 +1,183 @@
+from time import monotonic
+
+from .leaves import LEAVE_SIZE
+from .letterset import LetterSet
+from .lexicon import ALPHABET, LETTER_BITS, TERMINAL
+from .move import Move
+
+# An empty square in the cells of a line
+EMPTY = '\0'
+
+
+class MoveGenerator:
+    '''
+    Generates every legal Move for a rack on a Board using the Appel-Jacobson algorithm:
+    words are grown through each anchor square (an empty square next to a tile) by walking
+    the Lexicon trie, with letters restricted by the cross-check of each square. Anchors
+    and cross-checks are maintained by the Board itself.
+    '''
+
+    def __init__(self, board, lexicon=None, letter_set=None, leaves=None):
+        '''
+        Construct a new MoveGenerator for board. With a LeaveTable the equity of every Move
+        is looked up as it is found.
+        '''
+        self.board = board
+        self.leaves = leaves
+        self.lexicon = lexicon if lexicon is not None else board.lexicon
+        letter_set = letter_set if letter_set is not None else LetterSet()
+        self.scores = {c: letter_set.get_score(c) for c, _ in letter_set}
+
+    def generate(self, rack, deadline=None):
+        '''
+        Get all legal Moves for rack (a string of letters) sorted by descending score. If a
+        deadline (a time.monotonic() value) is given the search stops once it has passed and
+        the Moves found so far are returned; complete tells if the search finished.
+        '''
+        self.deadline = deadline
+        self.complete = True
+        board = self.board
+        w, h = board.width, board.height
+        cells = board.grid.cells.decode('ascii')
+
+        moves = []
+        self.generate_lines(cells, h, w, board.letter_multipliers, board.word_multipliers,
+                            board.cross_checks['right'], board.anchors, rack, 'right',
+                            lambda r, c: (c, r), moves)
+
+        # Down moves are generated as right moves on the transposed board
+        t = [r * w + c for c in range(w) for r in range(h)]
+        self.generate_lines(board.grid.transposed().decode('ascii'), w, h, [board.letter_multipliers[i] for i in t],
+                            [board.word_multipliers[i] for i in t],
+                            [board.cross_checks['down'][i] for i in t],
+                            set((i % w) * h + int(i / w) for i in board.anchors), rack, 'down',
+                            lambda r, c: (r, c), moves)
+
+        moves.sort(key=lambda m: m.score, reverse=True)
+        return moves
+
+    def cross_sums(self, cells, rows, cols, anchors):
+        '''
+        Get the summed score of the perpendicular word through each anchor, or -1 if there
+        is none
+        '''
+        scores = self.scores
+        sums = {}
+        for i in anchors:
+            total, found = 0, False
+            for step in (-cols, cols):
+                k = i + step
+                while 0 <= k < rows * cols and cells[k] != EMPTY:
+                    total += scores[cells[k]]
+                    found = True
+                    k += step
+            sums[i] = total if found else -1
+        return sums
+
+    def generate_lines(self, cells, rows, cols, lm, wm, cross, anchors, rack, direction, to_xy, moves):
+        '''
+        Generate the Moves along the rows of cells (a rows x cols grid) and append them to
+        moves. cross holds the cross-check of each square and to_xy maps a (row, column) of
+        cells back to Board coordinates.
+        '''
+        lexicon, scores, leaves = self.lexicon, self.scores, self.leaves
+        masks, firsts, edges = lexicon.masks, lexicon.firsts, lexicon.edges
+        sums = self.cross_sums(cells, rows, cols, anchors)
+
+        counts = dict.fromkeys(ALPHABET, 0)
+        for ch in rack:
+            counts[ch] += 1
+        # Single tile plays are found in both directions, only keep them once
+        singles = set(m.tiles[0] for m in moves if len(m.tiles) == 1)
+
+        def child(node, ch):
+            bit = LETTER_BITS[ch]
+            mask = masks[node]
+            if not mask & bit:
+                return None
+            return edges[firsts[node] + bin(mask & (bit - 1)).count('1')]
+
+        def record(row, end, word):
+            start = row * cols + end - len(word)
+            tiles = []
+            total, multiplier, extra = 0, 1, 0
+            for i, ch in enumerate(word):
+                idx = start + i
+                score = scores[ch]
+                if cells[idx] == EMPTY:
+                    tiles.append(to_xy(row, end - len(word) + i) + (ch,))
+                    score *= lm[idx]
+                    multiplier *= wm[idx]
+                    if sums.get(idx, -1) >= 0:
+                        extra += (sums[idx] + score) * wm[idx]
+                total += score
+            if len(tiles) == 1:
+                if tiles[0] in singles:
+                    return
+                singles.add(tiles[0])
+            x, y = to_xy(row, end - len(word))
+            move = Move(x, y, direction, word, tiles, total * multiplier + extra)
+            if leaves is not None and len(rack) - len(tiles) <= LEAVE_SIZE:
+                # counts holds the letters left on the rack, in alphabetical order
+                move.equity = move.score + leaves[''.join(ch * n for ch, n in counts.items() if n)]
+            moves.append(move)
+
+        def extend_right(row, word, node, col, anchor):
+            if col >= cols:
+                if col > anchor and masks[node] & TERMINAL:
+                    record(row, col, word)
+                return
+            idx = row * cols + col
+            ch = cells[idx]
+            if ch == EMPTY:
+                if col > anchor and masks[node] & TERMINAL:
+                    record(row, col, word)
+                allowed = masks[node] & cross[idx]
+                for ch, count in counts.items():
+                    if count and allowed & LETTER_BITS[ch]:
+                        counts[ch] -= 1
+                        extend_right(row, word + ch, child(node, ch), col + 1, anchor)
+                        counts[ch] += 1
+            else:
+                nxt = child(node, ch)
+                if nxt is not None:
+                    extend_right(row, word + ch, nxt, col + 1, anchor)
+
+        def left_part(row, word, node, limit, anchor):
+            extend_right(row, word, node, anchor, anchor)
+            if limit > 0:
+                allowed = masks[node]
+                for ch, count in counts.items():
+                    if count and allowed & LETTER_BITS[ch]:
+                        counts[ch] -= 1
+                        left_part(row, word + ch, child(node, ch), limit - 1, anchor)
+                        counts[ch] += 1
+
+        for idx in sorted(anchors):
+            if self.deadline is not None and monotonic() > self.deadline:
+                self.complete = False
+                return
+            row, col = divmod(idx, cols)
+            if col > 0 and cells[idx - 1] != EMPTY:
+                # The left part is fixed by the tiles already on the board
+                start = col
+                while start > 0 and cells[row * cols + start - 1] != EMPTY:
+                    start -= 1
+                word = cells[row * cols + start:idx]
+                node = lexicon.walk(word)
+                if node is not None:
+                    extend_right(row, word, node, col, col)
+            else:
+                # The left part may use empty squares which are not anchors themselves
+                limit = 0
+                while col - limit > 0 and cells[idx - limit - 1] == EMPTY and \
+                        idx - limit - 1 not in anchors:
+                    limit += 1
+                left_part(row, '', lexicon.ROOT, min(limit, len(rack) - 1), col)
+
+
+def generate_moves(board, rack, lexicon=None, letter_set=None, deadline=None, leaves=None):
+    '''
+    Get all legal Moves for rack on board sorted by descending score
+    '''
+    return MoveGenerator(board, lexicon, letter_set, leaves).generate(rack, deadline)
@@ -1,4 +1,4 @@
-from ui.lettertile_ui import LetterTileUI
+from .equity import best_exchange
 
 # Color hex code for each player
 COLORS = ['#b94cb0', '#6d9629', '#44529b', '#b46261']
@@ -24,22 +24,11 @@ class Player():
         self.game = game
         self.played_cb = None
 
-    def place_word(self):
+    def place_word(self, move):
         '''
         Place a Word on the Board
          '''
-
-        new_word_placed = self.game.ui.board.getNewWord()
-        x, y, direction, word = new_word_placed
-
-        if (self.game.ui.board.letters[112] == None):
-            raise Exception()
-
-        score = self.game.board.get_word_score(self.game.letters, x, y, direction, word)
-        self.game.add_word_by_current_player(self, x, y, direction, word)
-        self.played(self.PLACE_WORD, x, y, direction, word, score)
-
-        self.game.ui.update()
+        return self.game.play(move)
 
     def played(self, *move):
         '''
@@ -51,39 +40,25 @@ class Player():
 
     def update_letters(self):
         '''
-        Updates the players letters if necessary and possible
+        Updates the players letters if necessary and possible and returns the new letters
         '''
+        new_letters = ''
         if len(self.letters) < self.game.rack_size and self.game.letters.remaining_letters > 0:
-            count = min(self.game.rack_size - len(self.letters), self.game.letters.remaining_letters)
-            new_letters = self.game.get_letters(count)
+            new_letters = self.game.get_letters(self.game.rack_size - len(self.letters))
             self.letters += new_letters
-            for c in new_letters:
-                self.game.letters.decrease_count(c)
+        return new_letters
 
     def pass_turn(self):
         '''
         Player passes turn
         '''
-        self.played(self.PASS, )
+        self.game.pass_turn()
 
-    def exchange_letters(self):
+    def exchange_letters(self, letters=None):
         '''
-        Player exchanges letter(s)
+        Player exchanges letter(s), by default the ones which leave the most valuable rack
         '''
-        letters = ''.join(l.char for l in self.game.ui.scene.items() if type(l) is LetterTileUI and l.selected).lower()
-        if self.game.rack_size > self.game.letters.remaining_letters:
-            return self.played(self.EXCHANGE_LETTERS, '', '')
-
-        new_letters = self.game.get_letters(len(letters), msg='Exchanging letters %s<br>' % letters.upper())
-
-        for c in letters:
-            pos = self.letters.find(c)
-            self.letters = self.letters[:pos] + self.letters[pos + 1:]
-            self.game.letters.increase_count(c)
-
-        for c in new_letters:
-            self.game.letters.decrease_count(c)
-
-        self.letters += new_letters
+        if letters is None:
+            letters = best_exchange(self.letters)[0]
+        self.game.exchange(letters)
 
-        self.played(self.EXCHANGE_LETTERS, letters, new_letters)
\ No newline at end of file
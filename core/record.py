@@ -0,0 +1,275 @@
+from array import array
+import mmap
+import os
+import struct
+import sys
+
+from .game import Game
+from .move import Move
+from .player import Player
+
+# Absolute path of the default game archive
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_ARCHIVE_PATH = os.path.join(BASE_DIR, 'data', 'games.rec')
+
+# Game record: seed, board width and height, rack size and the number of players, draws
+# and turns, followed by the player names and the draws as length prefixed strings (of at
+# most MAX_TEXT bytes, longer names are cut) and the turns. A turn is a kind, a count, the
+# score, the length of the main word and the letters left in the bag afterwards, followed
+# by count (x, y, letter) tiles or count returned letters.
+RECORD_HEADER = struct.Struct('<qBBBBHH')
+TURN_HEADER = struct.Struct('<BBHBB')
+KINDS = [Player.PASS, Player.PLACE_WORD, Player.EXCHANGE_LETTERS]
+MAX_TEXT = 255
+
+# Archive: the records one after another in the data file, and their end offsets as little
+# endian uint64 in the index file next to it
+ARCHIVE_MAGIC = b'SCRBGAM2'
+
+
+class GameRecord:
+    '''
+    Everything needed to replay a game: the seed, the players in the order of play, every
+    group of letters drawn from the bag and the turns. turns holds (kind, data, score,
+    word_length, bag) where data are the (x, y, char) placed or the letters exchanged and
+    bag is the number of letters left in the bag after the turn.
+    '''
+
+    def __init__(self, seed, width, height, rack_size, players, draws=(), turns=()):
+        '''
+        Construct a new GameRecord
+        '''
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.rack_size = rack_size
+        self.players = list(players)
+        self.draws = list(draws)
+        self.turns = list(turns)
+
+    def encode(self):
+        '''
+        Get the record as bytes
+        '''
+        out = bytearray(RECORD_HEADER.pack(self.seed, self.width, self.height, self.rack_size,
+                                           len(self.players), len(self.draws), len(self.turns)))
+        for text in self.players + self.draws:
+            # Cut on a character boundary so the name still decodes
+            text = text.encode()[:MAX_TEXT].decode(errors='ignore').encode()
+            out.append(len(text))
+            out += text
+        for kind, data, score, word_length, bag in self.turns:
+            out += TURN_HEADER.pack(KINDS.index(kind), len(data), score, word_length, bag)
+            if kind == Player.PLACE_WORD:
+                for x, y, c in data:
+                    out += bytes((x, y, ord(c)))
+            else:
+                out += data.encode()
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, buffer):
+        '''
+        Read a record from bytes
+        '''
+        seed, width, height, rack_size, players, draws, turns = RECORD_HEADER.unpack_from(buffer)
+        buffer = bytes(buffer)
+        pos = RECORD_HEADER.size
+        texts = []
+        for _ in range(players + draws):
+            size = buffer[pos]
+            texts.append(buffer[pos + 1:pos + 1 + size].decode())
+            pos += 1 + size
+
+        record = cls(seed, width, height, rack_size, texts[:players], texts[players:])
+        for _ in range(turns):
+            kind, count, score, word_length, bag = TURN_HEADER.unpack_from(buffer, pos)
+            kind = KINDS[kind]
+            pos += TURN_HEADER.size
+            if kind == Player.PLACE_WORD:
+                data = [(buffer[i], buffer[i + 1], chr(buffer[i + 2]))
+                        for i in range(pos, pos + 3 * count, 3)]
+                pos += 3 * count
+            else:
+                data = buffer[pos:pos + count].decode()
+                pos += count
+            record.turns.append((kind, data, score, word_length, bag))
+        return record
+
+    def replay(self, turns=None, lexicon=None):
+        '''
+        Rebuild the Game after the first turns turns (all by default). The letters are drawn
+        as recorded and the moves are not checked against the lexicon again.
+        '''
+        game = Game(self.width, self.height, self.rack_size, lexicon, self.seed)
+        for name in self.players:
+            game.players.append(Player(name, game, color='#000000'))
+        draws = iter(self.draws)
+        game.get_letters = lambda count: game.letters.take(next(draws))
+
+        for kind, data, *_ in self.turns[:turns]:
+            game.set_next_player()
+            if kind == Player.PLACE_WORD:
+                x, y, _ = data[0]
+                game.play(Move(x, y, None, None, data), validate=False)
+            elif kind == Player.EXCHANGE_LETTERS:
+                game.exchange(data)
+            else:
+                game.pass_turn()
+        return game
+
+
+class GameRecorder:
+    '''
+    Records a Game while it is played, from its draws and the MoveEvents it publishes
+    '''
+
+    def __init__(self, game):
+        '''
+        Construct a new GameRecorder and start recording game
+        '''
+        self.game = game
+        self.draws = []
+        self.turns = []
+        self.draw = game.get_letters
+        game.get_letters = self.get_letters
+        game.add_listener(self.moveMade)
+
+    def get_letters(self, count):
+        '''
+        Draw letters for the game and remember them
+        '''
+        letters = self.draw(count)
+        self.draws.append(letters)
+        return letters
+
+    def moveMade(self, event):
+        '''
+        Remember the turn of a MoveEvent
+        '''
+        data = event.tiles if event.kind == Player.PLACE_WORD else event.returned
+        word_length = len(event.words[0][3]) if event.words else 0
+        self.turns.append((event.kind, data, event.score, word_length, event.remaining_letters))
+
+    def record(self):
+        '''
+        Get the GameRecord of the game so far
+        '''
+        game = self.game
+        return GameRecord(game.seed, game.width, game.height, game.rack_size,
+                          [p.name for p in game.players], self.draws, self.turns)
+
+
+class GameArchive:
+    '''
+    An append-only file of encoded GameRecords with an index, so any game can be read by its
+    id (its position in the archive) without reading the ones before it. Both files are
+    memory-mapped for reading.
+    '''
+
+    def __init__(self, filename=DEFAULT_ARCHIVE_PATH):
+        '''
+        Open the archive at filename, creating it if it does not exist
+        '''
+        self.filename = filename
+        self.index_filename = filename + '.idx'
+        if not os.path.exists(filename):
+            with open(filename, 'wb') as f:
+                f.write(ARCHIVE_MAGIC)
+            open(self.index_filename, 'wb').close()
+        self.data = self.index_map = self.index = None
+        self.map()
+
+    def map(self):
+        '''
+        (Re)map the data and index files
+        '''
+        self.close()
+        with open(self.filename, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+            self.close()
+            raise ValueError('%s is not a game archive' % self.filename)
+
+        # An empty file cannot be mapped
+        size = os.path.getsize(self.index_filename) // 8 * 8
+        if size == 0:
+            self.index = array('Q')
+            return
+        with open(self.index_filename, 'rb') as f:
+            self.index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if sys.byteorder == 'little':
+            self.index = memoryview(self.index_map)[:size].cast('Q')
+        else:
+            self.index = array('Q', self.index_map[:size])
+            self.index.byteswap()
+
+    def close(self):
+        '''
+        Unmap the files
+        '''
+        if isinstance(self.index, memoryview):
+            self.index.release()
+        for m in (self.index_map, self.data):
+            if m is not None:
+                m.close()
+        self.data = self.index_map = self.index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def raw(self, game_id):
+        '''
+        Get the encoded record of a game as a memoryview of the archive
+        '''
+        if not 0 <= game_id < len(self.index):
+            raise IndexError('no game %i in %s' % (game_id, self.filename))
+        start = self.index[game_id - 1] if game_id else len(ARCHIVE_MAGIC)
+        return memoryview(self.data)[start:self.index[game_id]]
+
+    def __getitem__(self, game_id):
+        '''
+        Get the GameRecord of a game
+        '''
+        view = self.raw(game_id)
+        try:
+            return GameRecord.decode(view)
+        finally:
+            view.release()
+
+    def __iter__(self):
+        for game_id in range(len(self)):
+            yield self[game_id]
+
+    def extend(self, records):
+        '''
+        Append GameRecords (or encoded records) to the archive
+        :return: The id of the last game added
+        '''
+        offsets = array('Q')
+        with open(self.filename, 'ab') as f:
+            end = f.tell()
+            for record in records:
+                data = record if isinstance(record, bytes) else record.encode()
+                f.write(data)
+                end += len(data)
+                offsets.append(end)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        with open(self.index_filename, 'ab') as f:
+            offsets.tofile(f)
+        self.map()
+        return len(self) - 1
+
+    def append(self, record):
+        '''
+        Append a GameRecord to the archive
+        :return: The id of the game
+        '''
+        return self.extend([record])
@@ -0,0 +1,84 @@
+STEPS = {'right': (1, 0), 'down': (0, 1)}
+
+
+def line_word(board, new, x, y, direction):
+    '''
+    Get the start and the letters of the word through (x, y) along direction, made of the
+    tiles on board and the new tiles (a dict of (x, y) -> char). Each letter is returned as
+    (index, char, is_new).
+    '''
+    dx, dy = STEPS[direction]
+    width, height, cells = board.width, board.height, board.grid.cells
+
+    # Walk back to the first letter of the word
+    while True:
+        px, py = x - dx, y - dy
+        if px < 0 or py < 0 or (not cells[py * width + px] and (px, py) not in new):
+            break
+        x, y = px, py
+
+    start = (x, y)
+    letters = []
+    while x < width and y < height:
+        code = cells[y * width + x]
+        if code:
+            letters.append((y * width + x, chr(code), False))
+        elif (x, y) in new:
+            letters.append((y * width + x, new[(x, y)], True))
+        else:
+            break
+        x, y = x + dx, y + dy
+    return start, letters
+
+
+def formed_words(board, tiles):
+    '''
+    Get the words of two or more letters formed by placing tiles (a list of (x, y, char)) on
+    board, as (start, direction, letters) with the letters of line_word. The main word comes
+    first, then the perpendicular word through each new tile. A single tile has no main
+    direction, so the words in both directions are returned.
+    '''
+    new = {(x, y): c for x, y, c in tiles}
+    if not new:
+        return []
+
+    x, y, _ = tiles[0]
+    if len(tiles) == 1:
+        lines = [('right', x, y), ('down', x, y)]
+    else:
+        direction = 'down' if all(t[0] == x for t in tiles) else 'right'
+        other = 'down' if direction == 'right' else 'right'
+        lines = [(direction, x, y)] + [(other, tx, ty) for tx, ty, _ in tiles]
+
+    words = []
+    for d, x, y in lines:
+        start, letters = line_word(board, new, x, y, d)
+        if len(letters) >= 2:
+            words.append((start, d, letters))
+    return words
+
+
+def score_tiles(board, letter_set, tiles):
+    '''
+    Score the placement of tiles (a list of (x, y, char) on empty squares of board) without
+    changing the board. Only the line of the play and the perpendicular words through the
+    new tiles are looked at. Premiums count only for squares covered by a new tile, as the
+    premiums under tiles already on the board have been used.
+    :return: The total score and a list of (x, y, direction, word, score) for every word formed
+    '''
+    letter_scores = letter_set.letters
+    lm, wm = board.letter_multipliers, board.word_multipliers
+    total = 0
+    words = []
+    for start, d, letters in formed_words(board, tiles):
+        score, multiplier = 0, 1
+        for i, c, is_new in letters:
+            if is_new:
+                score += letter_scores[c][0] * lm[i]
+                multiplier *= wm[i]
+            else:
+                score += letter_scores[c][0]
+        score *= multiplier
+        total += score
+        words.append(start + (d, ''.join(c for _, c, _ in letters), score))
+    return total, words
@@ -0,0 +1,73 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+import os
+
+from .game import Game
+from .lexicon import get_lexicon
+from .record import GameRecorder
+from .computer import ComputerPlayer
+from .strategies import STRATEGIES
+
+
+def play_game(seed, players=2, strategy='greedy', width=15, height=15, rack_size=7, record=False):
+    '''
+    Play one game between bots using strategy and return its result. With record the
+    encoded GameRecord is included as well.
+    '''
+    game = Game(width, height, rack_size, lexicon=get_lexicon(), seed=seed)
+    for i in range(players):
+        game.add_player(ComputerPlayer('Bot %i' % (i + 1), game, color='#000000', strength=strategy))
+    recorder = GameRecorder(game) if record else None
+
+    timings = []
+    start = perf_counter()
+    while game.get_state() == game.RUNNING:
+        game.set_next_player()
+        move_start = perf_counter()
+        player = game.current_player
+        player.play(player.choose())
+        timings.append(perf_counter() - move_start)
+
+    result = {
+        'seed': seed,
+        'players': [p.name for p in game.players],
+        'scores': [p.score for p in game.players],
+        'moves': len(game.moves),
+        'timings': timings,
+        'duration': perf_counter() - start,
+    }
+    if recorder:
+        result['record'] = recorder.record().encode()
+    return result
+
+
+def init_worker():
+    '''
+    Map the compiled lexicon once per worker process. Workers share its pages through the
+    page cache instead of each building their own copy.
+    '''
+    get_lexicon()
+
+
+def simulate(seeds, workers=None, chunksize=None, **kwargs):
+    '''
+    Play a game for every seed on a pool of worker processes and yield the results in the
+    order of seeds as soon as they are ready. Further keyword arguments go to play_game.
+    '''
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+
+    # Build or refresh the compiled lexicon before the workers map it
+    get_lexicon()
+
+    if workers == 1:
+        for seed in seeds:
+            yield play_game(seed, **kwargs)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(seeds) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=init_worker) as executor:
+        for result in executor.map(partial(play_game, **kwargs), seeds, chunksize=chunksize):
+            yield result
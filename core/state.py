@@ -0,0 +1,160 @@
+from .letter import Letter
+from .player import Player
+from .scoring import score_tiles
+
+
+class GameState:
+    '''
+    A position of a Game for searching and undo. The racks, scores and bag are immutable
+    strings and tuples, and the moves are a linked list, so clone only copies references.
+    The Board is copied on write: clones share it until one of them plays. apply and undo
+    only touch the tiles of a move.
+    '''
+
+    def __init__(self, board, letter_set, players, racks, scores, bag, player=0, rack_size=7,
+                 passes=0):
+        '''
+        Construct a new GameState. racks and scores hold one entry per player, bag is a
+        string of the letters left which are drawn from its end and player is the index of
+        the player to move.
+        '''
+        self.board = board
+        self.letter_set = letter_set
+        self.players = tuple(players)
+        self.racks = tuple(racks)
+        self.scores = tuple(scores)
+        self.bag = bag
+        self.player = player
+        self.rack_size = rack_size
+        self.passes = passes
+        self.history = None
+        self.shared = False
+
+    @classmethod
+    def from_game(cls, game):
+        '''
+        Get the GameState of game. The board is copied, so the game may go on.
+        '''
+        players = game.players
+        player = players.index(game.current_player) if game.current_player in players else 0
+        passes = 0
+        for _, move in reversed(game.moves):
+            if move[0] != Player.PASS:
+                break
+            passes += 1
+        return cls(game.board.copy(), game.letters, players, [p.letters for p in players],
+                   [p.score for p in players], ''.join(game.letters.bag), player,
+                   game.rack_size, passes)
+
+    @property
+    def rack(self):
+        '''
+        The rack of the player to move
+        '''
+        return self.racks[self.player]
+
+    def clone(self):
+        '''
+        Get an independent GameState which shares the board until either of them plays
+        '''
+        state = GameState.__new__(GameState)
+        state.__dict__.update(self.__dict__)
+        state.shared = self.shared = True
+        return state
+
+    def own_board(self):
+        '''
+        Copy the board before changing it if it is shared with a clone
+        '''
+        if self.shared:
+            self.board = self.board.copy()
+            self.shared = False
+        return self.board
+
+    def is_over(self):
+        '''
+        Check if the game has ended
+        '''
+        return (not self.bag and any(not rack for rack in self.racks)) or \
+            self.passes >= 2 * len(self.players)
+
+    def moves(self):
+        '''
+        Get the (player, kind, tiles, score) of the turns played on this state, oldest first
+        '''
+        moves = []
+        record = self.history
+        while record is not None:
+            moves.append(record[0])
+            record = record[1]
+        return [(self.players[p], kind, tiles, score) for p, kind, tiles, score, *_ in reversed(moves)]
+
+    def end_turn(self, kind, tiles, score, rack, bag, drawn):
+        '''
+        Give the player to move rack and score and remember how to undo the turn
+        '''
+        p = self.player
+        self.history = ((p, kind, tiles, score, self.racks[p], self.bag, self.passes), self.history)
+        self.racks = self.racks[:p] + (rack + drawn,) + self.racks[p + 1:]
+        self.scores = self.scores[:p] + (self.scores[p] + score,) + self.scores[p + 1:]
+        self.bag = bag
+        self.passes = self.passes + 1 if kind == Player.PASS else 0
+        self.player = (p + 1) % len(self.players)
+
+    def apply(self, move):
+        '''
+        Play move for the player to move, without checking it against the rules. The rack
+        is refilled from the end of the bag.
+        :return: The score of the move
+        '''
+        board = self.own_board()
+        if move.tiles is not None:
+            tiles = list(move.tiles)
+        else:
+            tiles = [(x, y, c) for x, y, c in move if board.get_letter(x, y) is None]
+        score, _ = score_tiles(board, self.letter_set, tiles)
+
+        player = self.players[self.player]
+        rack = self.rack
+        for x, y, c in tiles:
+            board.add_letter(Letter(c, player, x, y))
+            pos = rack.index(c)
+            rack = rack[:pos] + rack[pos + 1:]
+
+        count = min(self.rack_size - len(rack), len(self.bag))
+        bag, drawn = self.bag[:len(self.bag) - count], self.bag[len(self.bag) - count:]
+        self.end_turn(Player.PLACE_WORD, tiles, score, rack, bag, drawn)
+        return score
+
+    def exchange(self, letters):
+        '''
+        Swap letters from the rack of the player to move with as many from the end of the
+        bag. The returned letters go to the front of the bag.
+        '''
+        rack = self.rack
+        for c in letters:
+            pos = rack.index(c)
+            rack = rack[:pos] + rack[pos + 1:]
+        bag, drawn = self.bag[:len(self.bag) - len(letters)], self.bag[len(self.bag) - len(letters):]
+        self.end_turn(Player.EXCHANGE_LETTERS, (), 0, rack, letters + bag, drawn)
+
+    def pass_turn(self):
+        '''
+        The player to move passes
+        '''
+        self.end_turn(Player.PASS, (), 0, self.rack, self.bag, '')
+
+    def undo(self):
+        '''
+        Take back the last turn
+        '''
+        (p, kind, tiles, score, rack, bag, passes), self.history = self.history
+        if tiles:
+            board = self.own_board()
+            for x, y, _ in reversed(tiles):
+                board.remove_letter(x, y)
+        self.racks = self.racks[:p] + (rack,) + self.racks[p + 1:]
+        self.scores = self.scores[:p] + (self.scores[p] - score,) + self.scores[p + 1:]
+        self.bag = bag
+        self.passes = passes
+        self.player = p
@@ -0,0 +1,105 @@
+from random import Random
+
+from .equity import best_exchange, equity
+from .leaves import get_leaves
+from .montecarlo import evaluate
+from .movegen import MoveGenerator
+from .player import Player
+from .state import GameState
+
+
+def generate(game, rack):
+    '''
+    Get every legal Move for rack on the board of game sorted by descending score, with
+    their equity
+    '''
+    return MoveGenerator(game.board, game.board.lexicon, game.letters, get_leaves()).generate(rack)
+
+
+def greedy(game, player):
+    '''
+    Strategy which plays the highest scoring Move, or None to pass
+    '''
+    moves = generate(game, player.letters)
+    return moves[0] if moves else None
+
+
+def best_equity(game, player):
+    '''
+    Strategy which plays the Move with the highest equity, or exchanges the letters (a
+    string) if keeping the rest is worth more, or None to pass
+    '''
+    rack = player.letters
+    moves = generate(game, rack)
+    best = max(moves, key=lambda m: equity(m, rack), default=None)
+
+    # Exchanging is only possible with a full bag, and not twice in a row so that bots
+    # which cannot place a word still end the game by passing
+    last = next((move for p, move in reversed(game.moves) if p is player), None)
+    if game.letters.remaining_letters >= game.rack_size and \
+            (last is None or last[0] == Player.PLACE_WORD):
+        letters, value = best_exchange(rack)
+        if best is None or value > equity(best, rack):
+            return letters
+    return best
+
+
+def simulation(game, player):
+    '''
+    Strategy which looks one reply ahead, see look_ahead
+    '''
+    return look_ahead(GameState.from_game(game), '%i-%i' % (game.seed, game.turn))
+
+
+def look_ahead(state, seed, candidates=5, samples=8):
+    '''
+    Choose the move of the player to move on state by looking one reply ahead: for the
+    candidates with the highest equity the best reply to racks drawn from the unseen letters
+    is searched, and the Move with the highest equity less the average reply score is
+    played, or None to pass. The racks are drawn with seed.
+    '''
+    rack = state.rack
+    moves = MoveGenerator(state.board, state.board.lexicon, state.letter_set, get_leaves()).generate(rack)
+    moves = sorted(moves, key=lambda m: equity(m, rack), reverse=True)[:candidates]
+    if len(moves) < 2:
+        return moves[0] if moves else None
+
+    # The letters the player cannot see, drawn the same way for every candidate
+    unseen = state.bag + ''.join(r for p, r in enumerate(state.racks) if p != state.player)
+    rng = Random(seed)
+    racks = [''.join(rng.sample(unseen, min(state.rack_size, len(unseen)))) for _ in range(samples)]
+
+    # Every candidate is tried on the same state and taken back afterwards
+    def value(move):
+        state.apply(move)
+        generator = MoveGenerator(state.board, state.board.lexicon, state.letter_set)
+        replies = [generator.generate(r) for r in racks if r]
+        state.undo()
+        reply = sum(m[0].score for m in replies if m) / len(replies) if replies else 0
+        return equity(move, rack) - reply
+
+    return max(moves, key=value)
+
+
+def monte_carlo(game, player):
+    '''
+    Strategy which simulates the best candidates, see simulate_ahead
+    '''
+    return simulate_ahead(GameState.from_game(game), '%i-%i' % (game.seed, game.turn))
+
+
+def simulate_ahead(state, seed):
+    '''
+    Choose the candidate with the best mean equity over simulated games a turn ahead for the
+    player to move on state (see montecarlo.evaluate), or None to pass
+    '''
+    ranked = evaluate(state, candidates=5, plies=1, iterations=32, workers=1, seed=seed)
+    return ranked[0].move if ranked else None
+
+
+STRATEGIES = {'greedy': greedy, 'equity': best_equity, 'simulation': simulation,
+              'montecarlo': monte_carlo}
+
+# The strategies which also work on a GameState, taking the state and a seed. Their search
+# is long enough to be worth running in another process.
+STATE_STRATEGIES = {'simulation': look_ahead, 'montecarlo': simulate_ahead}
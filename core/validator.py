@@ -0,0 +1,106 @@
+from .scoring import formed_words
+
+# The rules a placement can break
+NO_TILES = 'no_tiles'
+OUTSIDE = 'outside'
+OCCUPIED = 'occupied'
+DUPLICATE = 'duplicate'
+NOT_IN_LINE = 'not_in_line'
+GAP = 'gap'
+NOT_ON_CENTER = 'not_on_center'
+NOT_CONNECTED = 'not_connected'
+TOO_SHORT = 'too_short'
+UNKNOWN_WORD = 'unknown_word'
+
+
+class MoveError:
+    '''
+    A rule broken by a placement, with the squares or words it concerns
+    '''
+
+    def __init__(self, code, message, squares=(), words=()):
+        '''
+        Construct a new MoveError
+        '''
+        self.code = code
+        self.message = message
+        self.squares = list(squares)
+        self.words = list(words)
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return 'MoveError(%r, %r)' % (self.code, self.message)
+
+
+def check_squares(board, tiles):
+    '''
+    Get the errors of tiles which are outside of board, on an occupied square or placed twice
+    on the same square
+    '''
+    errors = []
+    seen = set()
+    for x, y, _ in tiles:
+        if not (0 <= x < board.width and 0 <= y < board.height):
+            errors.append(MoveError(OUTSIDE, 'The word does not fit on the board.', [(x, y)]))
+        elif board.grid.cells[y * board.width + x]:
+            errors.append(MoveError(OCCUPIED, 'The square is already taken.', [(x, y)]))
+        elif (x, y) in seen:
+            errors.append(MoveError(DUPLICATE, 'Two letters were placed on the same square.', [(x, y)]))
+        seen.add((x, y))
+    return errors
+
+
+def validate_tiles(board, tiles, lexicon=None):
+    '''
+    Check the placement of tiles (a list of (x, y, char)) on board against the rules: the
+    tiles are in one line without gaps, the first word covers the centre, later words touch
+    the letters on the board and every word formed is in the lexicon (the board's Lexicon by
+    default). The words are found with the same line scans as the scoring and looked up
+    together.
+    :return: The (x, y, direction, word) of every word formed, main word first, and a list
+             of MoveErrors which is empty if the placement is allowed
+    '''
+    if not tiles:
+        return [], [MoveError(NO_TILES, 'No letters were placed.')]
+
+    errors = check_squares(board, tiles)
+    if errors:
+        return [], errors
+
+    if len(set(x for x, _, _ in tiles)) > 1 and len(set(y for _, y, _ in tiles)) > 1:
+        return [], [MoveError(NOT_IN_LINE, 'The letters must be placed in one line.',
+                              [(x, y) for x, y, _ in tiles])]
+
+    # Every square between the first and the last tile has to be filled
+    xs, ys = [x for x, _, _ in tiles], [y for _, y, _ in tiles]
+    new = set(zip(xs, ys))
+    for x in range(min(xs), max(xs) + 1):
+        for y in range(min(ys), max(ys) + 1):
+            if (x, y) not in new and not board.grid.cells[y * board.width + x]:
+                return [], [MoveError(GAP, 'The letters must form one word without gaps.', [(x, y)])]
+
+    lines = formed_words(board, tiles)
+    words = [start + (d, ''.join(c for _, c, _ in letters)) for start, d, letters in lines]
+
+    if board.count == 0:
+        center = (board.center % board.width, int(board.center / board.width))
+        if not any((x, y) == center for x, y, _ in tiles):
+            errors.append(MoveError(NOT_ON_CENTER, 'First word must be placed on the star in '
+                                                   'the centre of the board.', [center]))
+    elif not any(not is_new for _, _, letters in lines for _, _, is_new in letters):
+        errors.append(MoveError(NOT_CONNECTED, 'The word must be connected to the letters on '
+                                               'the board.', [(x, y) for x, y, _ in tiles]))
+
+    if not words:
+        errors.append(MoveError(TOO_SHORT, 'A word needs at least two letters.',
+                                [(x, y) for x, y, _ in tiles]))
+
+    lexicon = lexicon if lexicon is not None else board.lexicon
+    unknown = lexicon.unknown(word for _, _, _, word in words)
+    if unknown:
+        errors.append(MoveError(UNKNOWN_WORD, '%s %s not a valid word.' % (
+            ', '.join(w.upper() for w in unknown), 'is' if len(unknown) == 1 else 'are'),
+            words=unknown))
+    return words, errors
@@ -1,23 +1,65 @@
 from sys import argv
-from PyQt5.QtWidgets import QApplication
-from core.game import Game
-from ui.window_ui import WindowUI
-from core.player import Player
+from time import perf_counter
 
 def run():
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description='Play Scrabble')
+    parser.add_argument('--players', type=int, default=4, help='number of players (default: 4)')
+    parser.add_argument('--computers', type=int, default=0,
+                        help='how many of the players are played by the computer')
+    parser.add_argument('--strength', choices=['greedy', 'equity', 'simulation', 'montecarlo'],
+                        default='equity',
+                        help='how well the computer plays')
+    parser.add_argument('--profile-startup', action='store_true', help='print how long startup takes')
+    args, qt_args = parser.parse_known_args()
+    profile = args.profile_startup
+    timings = [('start', perf_counter())]
+
+    def mark(label):
+        '''
+        Record how long a startup step took and print it if profiling
+        '''
+        timings.append((label, perf_counter()))
+        if profile:
+            print('%-22s %7.1f ms  (total %7.1f ms)' % (label, (timings[-1][1] - timings[-2][1]) * 1000,
+                                                      (timings[-1][1] - timings[0][1]) * 1000))
+
+    # Import the heavy modules only once they are needed
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    mark('import PyQt5')
+    from core.game import Game
+    from core.computer import ComputerPlayer
+    from core.player import COLORS, Player
+    mark('import core')
+
+    # Every player needs a color of their own
+    if not 1 <= args.players <= len(COLORS):
+        parser.error('--players must be between 1 and %i' % len(COLORS))
+    if not 0 <= args.computers <= args.players:
+        parser.error('--computers must be between 0 and the number of players')
+    from ui.window_ui import WindowUI
+    mark('import ui')
 
     # Initialise Game
     game = Game(15, 15, 7)
 
     # Add players
-    game.add_player(Player("Player 1", game))
-    game.add_player(Player("Player 2", game))
-    game.add_player(Player("Player 3", game))
-    game.add_player(Player("Player 4", game))
+    humans = args.players - args.computers
+    for i in range(humans):
+        game.add_player(Player("Player %i" % (i + 1), game))
+    for i in range(args.computers):
+        game.add_player(ComputerPlayer("Computer %i" % (i + 1), game, strength=args.strength))
+    mark('create game')
 
     # Execute PyQt5
-    app = QApplication(argv)
+    app = QApplication(argv[:1] + qt_args)
+    mark('create application')
     win = WindowUI(game)
+    mark('create window')
+    QTimer.singleShot(0, lambda: mark('window usable'))
+    win.lexiconReady.connect(lambda lexicon: mark('lexicon loaded'))
     app.exec_()
 
 if __name__ == '__main__':
@@ -0,0 +1,45 @@
+from argparse import ArgumentParser
+from json import dumps
+from sys import stderr, stdout
+from time import perf_counter
+
+from core.record import GameArchive
+from core.simulation import STRATEGIES, simulate
+
+# Records written to the archive at once
+ARCHIVE_BATCH = 1000
+
+def run():
+    parser = ArgumentParser(description='Play bot-vs-bot games and print one JSON result per game')
+    parser.add_argument('-n', '--games', type=int, default=100, help='number of games')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('-p', '--players', type=int, default=2, help='players per game')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='greedy')
+    parser.add_argument('-w', '--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('--chunksize', type=int, help='games sent to a worker at once')
+    parser.add_argument('--archive', help='also append the games to this game archive')
+    args = parser.parse_args()
+
+    archive = GameArchive(args.archive) if args.archive else None
+    records = []
+    start = perf_counter()
+    seeds = range(args.seed, args.seed + args.games)
+    for result in simulate(seeds, workers=args.workers, chunksize=args.chunksize,
+                           players=args.players, strategy=args.strategy,
+                           record=archive is not None):
+        if archive is not None:
+            records.append(result.pop('record'))
+            if len(records) == ARCHIVE_BATCH:
+                archive.extend(records)
+                records = []
+        stdout.write(dumps(result) + '\n')
+        stdout.flush()
+    if archive is not None:
+        archive.extend(records)
+        archive.close()
+    elapsed = perf_counter() - start
+    print('%i games in %.1fs (%.1f games/min)' % (args.games, elapsed, args.games / elapsed * 60),
+          file=stderr)
+
+if __name__ == '__main__':
+    run()
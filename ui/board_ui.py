@@ -1,19 +1,11 @@
 from PyQt5.QtCore import Qt, QRect, QRectF, QPointF
 from PyQt5.QtWidgets import QGraphicsItem
-from PyQt5.QtGui import QColor, QPen, QFont
-from itertools import product, takewhile
-import os
+from PyQt5.QtGui import QColor, QPen, QFont, QPainter, QPixmap
+from itertools import product
 
+from core.layout import get_layout
 from .lettertile_ui import LetterTileUI
 
-import pandas as pd
-
-# Read words.csv file for words.csv that act a dictionary for the game
-# Read board_multiplier.csv file for assigning colors and score labels
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-DEFAULT_WORDS_PATH = os.path.join(BASE_DIR, 'data', 'words.csv')
-BOARD_MULTIPLIER_PATH = os.path.join(BASE_DIR, 'data', 'board_multiplier.csv')
-
 class BoardUI(QGraphicsItem):
     '''
     A graphical representation of a scrabble board. It also keeps track of
@@ -29,8 +21,13 @@ class BoardUI(QGraphicsItem):
     FONT_LEGEND = QFont('Sans', int((LetterTileUI.LETTER_SIZE + 10) / 5))
     PEN_LEGEND = QPen(QColor('#000'), 1, Qt.SolidLine)
 
-    # Read Board Multiplier CSV
-    df = pd.read_csv(BOARD_MULTIPLIER_PATH, header=None)
+    # Using Python Dictionary to map the score labels and colors
+    COLOR_DICT = {'w3': QColor(241, 63, 63), 'w2': QColor(249, 187, 190),
+                  'l3': QColor(8, 170, 253), 'l2': QColor(95, 224, 255),
+                  '1': QColor(11, 158, 129), 'm': QColor(249, 187, 190)}
+    TEXT_DICT = {'w3': 'Triple\nWord', 'w2': 'Double\nWord',
+                 'l3': 'Triple\nLetter', 'l2': 'Double\nLetter',
+                 '1': "", 'm': ""}
 
     def __init__(self, width, height):
         '''
@@ -38,13 +35,26 @@ class BoardUI(QGraphicsItem):
         '''
         super().__init__()
 
-        # Read Words CSV
-        self.words = pd.read_csv(DEFAULT_WORDS_PATH, sep=',', header=None).values
+        # Shared Lexicon that acts as the dictionary for the game, set by the window once
+        # it has been loaded in the background
+        self.lexicon = None
         self.width = width
         self.height = height
         self.rect = QRectF(0, 0, width * self.CELL_SIZE + self.LEGEND_SIZE, height * self.CELL_SIZE + self.LEGEND_SIZE)
         self.letters = [None for _ in range(width * height)]
         self.highlight = None
+        self.repaint_count = 0
+
+        # Position of every tile on the board and the tiles which are not confirmed yet
+        self.positions = {}
+        self.pending = set()
+
+        # Premium squares for assigning colors and score labels
+        self.layout = get_layout()
+
+        # The static board rendered for the current zoom level
+        self.background = None
+        self.background_scale = None
 
     def boundingRect(self):
         '''
@@ -54,24 +64,49 @@ class BoardUI(QGraphicsItem):
 
     def paint(self, painter, objects, widget):
         '''
-        Required by QGraphicsItem
+        Required by QGraphicsItem. Draws the cached static board and the highlighted cell.
+        '''
+        scale = painter.worldTransform().m11() * (widget.devicePixelRatioF() if widget else 1)
+        if self.background is None or self.background_scale != scale:
+            self.background = self.renderBackground(scale)
+            self.background_scale = scale
+        painter.drawPixmap(self.rect, self.background, QRectF(self.background.rect()))
+
+        if self.highlight is not None:
+            x, y = self.highlight
+            painter.setPen(self.PEN_GRID)
+            painter.setBrush(self.COLOR_HIGHLIGHT)
+            painter.drawRect(QRectF(self.LEGEND_SIZE + x * self.CELL_SIZE,
+                                    self.LEGEND_SIZE + y * self.CELL_SIZE,
+                                    self.CELL_SIZE, self.CELL_SIZE))
+
+    def renderBackground(self, scale):
+        '''
+        Render the static board (premium colors, labels and legend) into a pixmap for a zoom
+        level. It is only rendered again when the zoom level changes on resize.
+        '''
+        pixmap = QPixmap(int(self.rect.width() * scale) + 1, int(self.rect.height() * scale) + 1)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.scale(scale, scale)
+        self.paintBackground(painter)
+        painter.end()
+        return pixmap
+
+    def paintBackground(self, painter):
+        '''
+        Paint the static board
         '''
         painter.setFont(self.FONT_LEGEND)
         
         for y, x in product(range(self.height), range(self.width)):
 
             painter.setPen(self.PEN_GRID)
-            currentGrid = self.df.loc[x, y]
-
-            # Using Python Dictionary to map the score labels and colors
-            colorDict = {'w3': QColor(241, 63, 63), 'w2': QColor(249, 187, 190),
-                         'l3': QColor(8, 170, 253), 'l2': QColor(95, 224, 255),
-                         '1': QColor(11, 158, 129), 'm': QColor(249, 187, 190)}
-            textDict = {'w3': 'Triple\nWord', 'w2': 'Double\nWord',
-                        'l3': 'Triple\nLetter', 'l2': 'Double\nLetter',
-                        '1': "", 'm': ""}
-            
-            painter.setBrush(colorDict.get(currentGrid))
+            currentGrid = self.layout.labels[y * self.width + x]
+
+            painter.setBrush(self.COLOR_DICT.get(currentGrid))
 
             painter.drawRect(self.LEGEND_SIZE + x * self.CELL_SIZE,
                              self.LEGEND_SIZE + y * self.CELL_SIZE,
@@ -81,7 +116,7 @@ class BoardUI(QGraphicsItem):
 
             painter.drawText(QRect(self.LEGEND_SIZE + x * self.CELL_SIZE,
                              self.LEGEND_SIZE + y * self.CELL_SIZE,
-                             self.CELL_SIZE, self.CELL_SIZE),Qt.AlignCenter,str(textDict.get(currentGrid)))
+                             self.CELL_SIZE, self.CELL_SIZE),Qt.AlignCenter,str(self.TEXT_DICT.get(currentGrid)))
             
             if x == 0:
                 painter.setPen(self.PEN_LEGEND)
@@ -111,19 +146,37 @@ class BoardUI(QGraphicsItem):
         else:
             return (ix, iy)
 
+    def cellRect(self, x, y):
+        '''
+        Get the rectangle of the cell at (x, y), including its border
+        '''
+        return QRectF(self.LEGEND_SIZE + x * self.CELL_SIZE - 1,
+                      self.LEGEND_SIZE + y * self.CELL_SIZE - 1,
+                      self.CELL_SIZE + 2, self.CELL_SIZE + 2)
+
+    def setHighlight(self, highlight):
+        '''
+        Move the highlight to another cell (or None) and repaint only the two cells involved
+        '''
+        if highlight == self.highlight:
+            return
+        for cell in (self.highlight, highlight):
+            if cell is not None:
+                self.repaint_count += 1
+                self.update(self.cellRect(*cell))
+        self.highlight = highlight
+
     def letterMoveEvent(self, letter):
         '''
         Event that occurs when letter is moved
         '''
-        self.highlight = self.get_position(letter)
-        self.update(self.rect)
+        self.setHighlight(self.get_position(letter))
 
     def letterMoveOutEvent(self, letter):
         '''
         Event that occurs when letter is moved out
         '''
-        self.highlight = None
-        self.update(self.rect)
+        self.setHighlight(None)
 
     def letterReleaseEvent(self, letter):
         '''
@@ -131,14 +184,16 @@ class BoardUI(QGraphicsItem):
         '''
         pos = self.get_position(letter)
         letter.own(self, *pos) if pos else letter.undo()
-        self.highlight = None
-        self.update(self.rect)
+        self.setHighlight(None)
 
     def addLetter(self, letter, x, y, move=True):
         '''
         Places a letter on the board
         '''
         self.letters[y * self.width + x] = letter
+        self.positions[letter] = (x, y)
+        if not letter.is_safe:
+            self.pending.add(letter)
         pos = QPointF(self.LEGEND_SIZE + x * self.CELL_SIZE +
                       int((self.CELL_SIZE - letter.LETTER_SIZE) / 2),
                       self.LEGEND_SIZE + y * self.CELL_SIZE +
@@ -149,105 +204,25 @@ class BoardUI(QGraphicsItem):
         '''
         Removes a letter on the board
         '''
-        self.letters[y * self.height + x] = None
+        self.letters[y * self.width + x] = None
+        del self.positions[letter]
+        self.pending.discard(letter)
 
     def getLetter(self, x, y):
         '''
         Get the letter at position (x, y)
         '''
-        return self.letters[y * self.height + x]
+        return self.letters[y * self.width + x]
 
     def getLetterPosition(self, letter):
         '''
         Get the position of a letter
         '''
-        for i, l in enumerate(self.letters):
-            if letter == l:
-                return (i % self.width, int(i / self.width))
-
-    def validateWord(self):
-        '''
-        Validate word
-        '''
-        return self.currentWord in self.words
+        return self.positions.get(letter)
 
-    def validNewWord(self):
+    def getPendingTiles(self):
         '''
-        Checks if there is one valid new word on the board
+        Get the (x, y, char) of the tiles which are not confirmed yet, row by row
         '''
-        letters_ = [l for l in self.letters if l and not l.is_safe]
-        letters = [self.getLetterPosition(l) for l in letters_]
-        old_letters = [l for l in self.letters if l and l.is_safe]
-
-        if len(letters) == 0 or \
-                not (len(set(l[0] for l in letters)) == 1 or
-                     len(set(l[1] for l in letters)) == 1):
-            return False
-
-        letter = letters[0]
-        direction = 'right'
-
-        if len(letters) == 1:
-            l = letters[0]
-            if (l[1] - 1 >= 0 and self.getLetter(l[0], l[1] - 1)) or \
-                    (l[1] + 1 < self.height and self.getLetter(l[0], l[1] + 1)):
-                direction = 'down'
-        elif letters[0][0] == letters[-1][0]:
-            direction = 'down'
-
-        if direction == 'right':
-            row = [self.getLetter(x, letter[1]) for x in range(self.width)]
-            pivot = letter[0]
-        else:
-            row = [self.getLetter(letter[0], y) for y in range(self.height)]
-            pivot = letter[1]
-
-        word_right = list(takewhile(lambda x: x, row[pivot:]))
-        word_left = row[:pivot]
-        word_left.reverse()
-        word_left = list(takewhile(lambda x: x, word_left))
-        word_left.reverse()
-        word = word_left + word_right
-
-        wordStr = ''
-        for letterItem in word:
-            wordStr += letterItem.char.lower()
-        self.currentWord = wordStr
-
-        return all(l is not None for l in word) and \
-               (not old_letters or any(l.is_safe for l in word)) and \
-               all(l in word for l in letters_)
-
-    def getNewWord(self):
-        '''
-        Gets the new word placed on board
-        '''
-        letters = [self.getLetterPosition(l) for l in self.letters if l and not l.is_safe]
-        letter = letters[0]
-        direction = 'right'
-
-        if len(letters) == 1:
-            l = letters[0]
-            if (l[1] - 1 >= 0 and self.getLetter(l[0], l[1] - 1)) or \
-                    (l[1] + 1 < self.height and self.getLetter(l[0], l[1] + 1)):
-                direction = 'down'
-        elif letters[0][0] == letters[-1][0]:
-            direction = 'down'
-
-        if direction == 'right':
-            row = [self.getLetter(x, letter[1]) for x in range(self.width)]
-            pivot = letter[0]
-        else:
-            row = [self.getLetter(letter[0], y) for y in range(self.height)]
-            pivot = letter[1]
-
-        word_right = list(takewhile(lambda x: x, row[pivot:]))
-        word_left = row[:pivot]
-        word_left.reverse()
-        word_left = list(takewhile(lambda x: x, word_left))
-        word_left.reverse()
-        word = word_left + word_right
-        x, y = self.getLetterPosition(word[0])
-
-        return self.getLetterPosition(word[0]) + \
-               (direction, ''.join(l.char for l in word).lower())
+        return sorted((self.positions[l] + (l.char.lower(),) for l in self.pending),
+                      key=lambda t: (t[1], t[0]))
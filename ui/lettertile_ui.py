@@ -19,6 +19,16 @@ class LetterTileUI(QGraphicsWidget):
         Construct a new visual representation of a tile
         '''
         super().__init__()
+        self.view = None
+        self.animation = None
+        self.pool = None
+        self.size = QSizeF(self.LETTER_SIZE, self.LETTER_SIZE)
+        self.reset(char, score, color, safe)
+
+    def reset(self, char, score, color, safe=False):
+        '''
+        (Re)initialise the tile to show char, so faded tiles can be reused
+        '''
         self.owner = None
         self.char = char.upper()
         self.score = str(score)
@@ -32,15 +42,13 @@ class LetterTileUI(QGraphicsWidget):
         self.safe_brush = self.color_bg
         self.hovers = set()
         self.selected = False
-        self.view = None
-        self.animation = None
         self.deleted = False
-        self.size = QSizeF(self.LETTER_SIZE, self.LETTER_SIZE)
         self.setFlag(self.ItemIsMovable, not safe)
         self.setFlag(self.ItemSendsGeometryChanges, not safe)
         self.setCursor(Qt.ArrowCursor if safe else Qt.OpenHandCursor)
         self.setZValue(1)
         self.setOpacity(0)
+        self.update()
 
     def boundingRect(self):
         '''
@@ -90,13 +98,19 @@ class LetterTileUI(QGraphicsWidget):
                 return value
         elif change == self.ItemVisibleChange and self.isVisible() and \
              not self.deleted:
-            self.animation = QPropertyAnimation(self, b'opacity')
-            self.animation.setDuration(250)
-            self.animation.setStartValue(0)
-            self.animation.setEndValue(1)
-            self.animation.start()
+            self.fadeIn()
         return super().itemChange(change, value)
 
+    def fadeIn(self):
+        '''
+        A simple animation to show the letter tile
+        '''
+        self.animation = QPropertyAnimation(self, b'opacity')
+        self.animation.setDuration(250)
+        self.animation.setStartValue(0)
+        self.animation.setEndValue(1)
+        self.animation.start()
+
     def mousePressEvent(self, event):
         '''
         Event fired when the letter tile is pressed
@@ -139,6 +153,8 @@ class LetterTileUI(QGraphicsWidget):
         super().mouseReleaseEvent(event)
         if self.last_valid_position == self.scenePos() and not self.is_safe:
             self.selected = not self.selected
+            if type(self.owner) is RackTileUI:
+                self.owner.selectLetter(self)
             if self.scene() and self.scene().views():
                 self.scene().views()[0].letterChanged.emit()
         else:
@@ -188,8 +204,10 @@ class LetterTileUI(QGraphicsWidget):
 
     def remove(self):
         '''
-        Delete letter tile
+        Delete letter tile, or give it back to its pool for reuse
         '''
+        if self.pool:
+            return self.pool.release(self)
         self.scene().removeItem(self)
         del self
 
@@ -202,4 +220,37 @@ class LetterTileUI(QGraphicsWidget):
         self.animation.setStartValue(self.opacity())
         self.animation.setEndValue(0)
         self.animation.finished.connect(self.remove)
-        self.animation.start()
\ No newline at end of file
+        self.animation.start()
+
+
+class LetterTilePool:
+    '''
+    Keeps faded letter tiles for reuse, so the scene only holds the tiles which are in play
+    and does not grow with every turn
+    '''
+
+    def __init__(self):
+        self.free = []
+
+    def acquire(self, char, score, color, safe=False):
+        '''
+        Get a tile showing char, reusing a faded one if possible. The caller adds it to the scene.
+        '''
+        if self.free:
+            tile = self.free.pop()
+            tile.reset(char, score, color, safe)
+            tile.fadeIn()
+        else:
+            tile = LetterTileUI(char, score, color, safe)
+            tile.pool = self
+        return tile
+
+    def release(self, tile):
+        '''
+        Take a faded tile out of the scene and keep it for reuse
+        '''
+        if tile.animation:
+            tile.animation.stop()
+        if tile.scene():
+            tile.scene().removeItem(tile)
+        self.free.append(tile)
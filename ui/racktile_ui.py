@@ -27,7 +27,9 @@ class RackTileUI(QGraphicsItem):
         self.height = int(self.CELL_SIZE * 7 / 4)
         self.rect = QRectF(0, 0, self.width, self.height)
         self.highlight = None
+        self.repaint_count = 0
         self.letters = [None for _ in range(size)]
+        self.selected = set()
         self.setPos((max(self.width, width * 60 + 30) - self.width) / 2, 60 * height + 30)
 
     def boundingRect(self):
@@ -71,19 +73,36 @@ class RackTileUI(QGraphicsItem):
         else:
             return int(x / self.CELL_SIZE)
 
+    def cellRect(self, position):
+        '''
+        Get the rectangle of the cell at position, including its border
+        '''
+        return QRectF(self.CELL_SIZE * position - 1, int(self.CELL_SIZE * 3 / 4) - 1,
+                      self.CELL_SIZE + 2, self.CELL_SIZE + 2)
+
+    def setHighlight(self, highlight):
+        '''
+        Move the highlight to another cell (or None) and repaint only the two cells involved
+        '''
+        if highlight == self.highlight:
+            return
+        for cell in (self.highlight, highlight):
+            if cell is not None:
+                self.repaint_count += 1
+                self.update(self.cellRect(cell))
+        self.highlight = highlight
+
     def letterMoveEvent(self, letter):
         '''
         Custom letter event
         '''
-        self.highlight = self.position(letter)
-        self.update(self.rect)
+        self.setHighlight(self.position(letter))
 
     def letterMoveOutEvent(self, letter):
         '''
         Custom letter event
         '''
-        self.highlight = None
-        self.update(self.rect)
+        self.setHighlight(None)
 
     def letterReleaseEvent(self, letter):
         '''
@@ -91,8 +110,7 @@ class RackTileUI(QGraphicsItem):
         '''
         pos = self.position(letter)
         letter.undo() if pos is None else letter.own(self, pos)
-        self.highlight = None
-        self.update(self.rect)
+        self.setHighlight(None)
 
     def addLetter(self, letter, position, move=True):
         '''
@@ -100,6 +118,8 @@ class RackTileUI(QGraphicsItem):
         '''
         assert self.letters[position] is None
         self.letters[position] = letter
+        if letter.selected:
+            self.selected.add(letter)
         pos = QPointF(position * self.CELL_SIZE + int((self.CELL_SIZE -
                       letter.LETTER_SIZE) / 2), int(self.CELL_SIZE * 3 / 4) +
                       int((self.CELL_SIZE - letter.LETTER_SIZE) / 2))
@@ -110,4 +130,17 @@ class RackTileUI(QGraphicsItem):
         Remove a letter from the board
         '''
         assert self.letters[position] == letter
-        self.letters[position] = None
\ No newline at end of file
+        self.letters[position] = None
+        self.selected.discard(letter)
+
+    def selectLetter(self, letter):
+        '''
+        Keep track of a letter on the rack being selected or unselected
+        '''
+        (self.selected.add if letter.selected else self.selected.discard)(letter)
+
+    def getSelected(self):
+        '''
+        Get the selected letters in the order of the rack
+        '''
+        return ''.join(l.char for l in self.letters if l in self.selected)
@@ -1,19 +1,35 @@
 from operator import attrgetter
-from PyQt5.QtCore import Qt
+import logging
+from threading import Thread
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QGraphicsScene, QGroupBox, QLabel, QPushButton, \
     QMessageBox, QInputDialog
 from PyQt5.QtGui import QColor, QBrush
 
+from core.game import InvalidMove
+from core.hints import Hints
+from core.lexicon import get_lexicon
+from core.move import Move
+from core.computer import ComputerPlayer
 from core.player import Player
+from core.record import GameArchive, GameRecorder
+from core.validator import UNKNOWN_WORD, validate_tiles
 from .board_ui import BoardUI
 from .racktile_ui import RackTileUI
-from .lettertile_ui import LetterTileUI
+from .lettertile_ui import LetterTilePool
 from .board_scale_ui import BoardScaleUI
 
 class WindowUI(QWidget):
     '''
     The Main Window
     '''
+    lexiconReady = pyqtSignal(object)
+    hintReady = pyqtSignal(object)
+    computerReady = pyqtSignal(object)
+
+    # Number of Moves suggested by a hint and the seconds spent looking for them
+    HINT_COUNT = 5
+    HINT_BUDGET = 2.0
 
     def __init__(self, game):
         super().__init__()
@@ -38,6 +54,7 @@ class WindowUI(QWidget):
         self.scene.setBackgroundBrush(QBrush(QColor('#fff')))
         self.scene.addItem(self.board)
         self.scene.addItem(self.rack)
+        self.tiles = LetterTilePool()
         self.scene.setSceneRect(self.scene.itemsBoundingRect())
         self.view = BoardScaleUI(self.scene, self)
         self.view.letterChanged.connect(self.letterChanged)
@@ -66,7 +83,7 @@ class WindowUI(QWidget):
         # Create buttons and set the specification for the buttons
         self.buttons = QVBoxLayout()
         self.buttons.setSpacing(3)
-        self.place_word_button = QPushButton('Place &Word')
+        self.place_word_button = QPushButton('Loading Words...')
         self.place_word_button.setEnabled(False)
         self.place_word_button.setFixedSize(200, 50)
         self.place_word_button.clicked.connect(self.continueClicked)
@@ -82,7 +99,12 @@ class WindowUI(QWidget):
         self.end_game_button.setEnabled(True)
         self.end_game_button.setFixedSize(200, 50)
         self.end_game_button.clicked.connect(self.endGameClicked)
+        self.hint_button = QPushButton('&Hint')
+        self.hint_button.setEnabled(False)
+        self.hint_button.setFixedSize(200, 50)
+        self.hint_button.clicked.connect(self.hintClicked)
         self.buttons.addWidget(self.end_game_button, alignment=Qt.AlignCenter)
+        self.buttons.addWidget(self.hint_button, alignment=Qt.AlignCenter)
         self.buttons.addWidget(self.exchange_button, alignment=Qt.AlignCenter)
         self.buttons.addWidget(self.pass_button, alignment=Qt.AlignCenter)
         self.buttons.addWidget(self.place_word_button, alignment=Qt.AlignCenter)
@@ -107,6 +129,25 @@ class WindowUI(QWidget):
         self.setLayout(layout)
         self.show()
 
+        # Load the Lexicon in the background so the window is usable straight away. The thread
+        # starts from the event loop, so slots connected after the window is made get the signal.
+        self.lexiconReady.connect(self.lexiconLoaded)
+        QTimer.singleShot(0, self.loadLexicon)
+
+        # Hints are searched on a worker thread and shown once they are ready
+        self.hints = Hints(self.game.board, self.game.letters, self.HINT_COUNT, self.HINT_BUDGET)
+        self.hintReady.connect(self.hintFound)
+
+        # Computer players think on a worker thread and move once they are done
+        self.computerReady.connect(self.computerMoved)
+
+        # Apply only the changes of each turn instead of rescanning the board
+        self.last_event = None
+        self.game.add_listener(self.moveMade)
+
+        # Keep a record of the game, it is added to the archive when the game is over
+        self.recorder = GameRecorder(self.game)
+
         for player in self.game.players:
             player.played_cb = self.playerDone
         self.playerNext()
@@ -125,7 +166,7 @@ class WindowUI(QWidget):
                                  'Placed Words: %i\n' +
                                  'Remaining Letters: %i') %
                                 (len(self.game.players),
-                                 len(list(self.game.board.get_words())),
+                                 self.game.word_count,
                                  self.game.letters.remaining_letters))
         moves = []
         for i, (player, move) in list(enumerate(self.game.moves))[-10:]:
@@ -141,21 +182,55 @@ class WindowUI(QWidget):
 
         super().update(*args, **kwargs)
 
+    def loadLexicon(self):
+        '''
+        Start loading the Lexicon on a background thread, lexiconReady is emitted once it is loaded
+        '''
+        Thread(target=lambda: self.lexiconReady.emit(get_lexicon()), daemon=True).start()
+
+    def lexiconLoaded(self, lexicon):
+        '''
+        Enable placing words once the Lexicon has been loaded
+        '''
+        self.board.lexicon = lexicon
+        self.place_word_button.setText('Place &Word')
+        self.letterChanged()
+
+    def moveMade(self, event):
+        '''
+        Remember the MoveEvent of the turn which is being completed
+        '''
+        self.last_event = event
+
     def letterChanged(self):
         '''
         As soon as a letter changes we need to enable/disable all controls
         '''
         self.exchange_button.setEnabled(False)
         self.exchange_button.setText('Exchange')
+        if isinstance(self.game.current_player, ComputerPlayer):
+            self.pass_button.setEnabled(False)
+            self.place_word_button.setEnabled(False)
+            self.hint_button.setEnabled(False)
+            return
+        self.hint_button.setEnabled(self.board.lexicon is not None)
         if self.game.letters.remaining_letters >= self.game.rack_size:
-            selected = ''.join(l.char for l in self.scene.items()
-                               if type(l) is LetterTileUI and l.selected)
+            selected = self.rack.getSelected()
             if selected:
                 self.exchange_button.setText('Exchange: %s' % selected)
                 self.exchange_button.setEnabled(True)
         self.pass_button.setEnabled(True)
-        self.place_word_button.setEnabled(True if self.board.validNewWord() else
-                                        False)
+        self.place_word_button.setEnabled(self.canPlaceWord())
+
+    def canPlaceWord(self):
+        '''
+        Check if the new letters on the board may be placed. Unknown words are only reported
+        when the word is placed.
+        '''
+        if self.board.lexicon is None or not self.board.pending:
+            return False
+        _, errors = validate_tiles(self.game.board, self.board.getPendingTiles(), self.board.lexicon)
+        return all(error.code == UNKNOWN_WORD for error in errors)
 
     def playerNext(self):
         '''
@@ -166,20 +241,51 @@ class WindowUI(QWidget):
 
         self.letterChanged()
         self.update()
-        player.update_letters()
 
         self.rack.name = self.game.current_player.name
         self.rack.color = self.game.current_player.color
 
+        computer = isinstance(player, ComputerPlayer)
         for i, letter in enumerate(player.letters):
-            item = LetterTileUI(letter, self.game.letters.get_score(letter),
-                              player.color)
+            item = self.tiles.acquire(letter, self.game.letters.get_score(letter),
+                                      player.color, safe=computer)
             item.own(self.rack, i, move=False)
             self.scene.addItem(item)
 
         self.update()
         player.played_cb = self.playerDone
 
+        # The other computer players value their racks while this player thinks
+        for other in self.game.players:
+            if isinstance(other, ComputerPlayer) and other is not player:
+                other.prepare()
+        if computer:
+            self.computerThink(player)
+
+    def computerThink(self, player):
+        '''
+        Let a computer player choose its move on a worker thread. The worker waits for the
+        Lexicon itself if it is still loading.
+        '''
+        future = player.think()
+        future.add_done_callback(lambda f: self.computerReady.emit((player, f)))
+
+    def computerMoved(self, result):
+        '''
+        Play the move chosen by a computer player through the same path as the buttons
+        '''
+        player, future = result
+        if player is not self.game.current_player:
+            return
+        try:
+            player.play(future.result())
+        except InvalidMove:
+            player.pass_turn()
+        except Exception:
+            # A failed search must not leave the game waiting for the computer player
+            logging.getLogger(__name__).exception('%s could not choose a move', player.name)
+            player.pass_turn()
+
     def playerDone(self, player, move, *args):
         '''
         Complete player's turn
@@ -189,21 +295,19 @@ class WindowUI(QWidget):
         self.pass_button.setEnabled(False)
         self.place_word_button.setEnabled(False)
 
-        for item in self.scene.items():
-            if type(item) is LetterTileUI and not item.is_safe and not item.deleted:
-                item.own(None)
-                item.fade()
+        for item in list(self.board.pending) + [l for l in self.rack.letters if l]:
+            item.own(None)
+            item.fade()
 
-        for x, y, letter in self.game.board:
-            if not self.board.getLetter(x, y):
-                item = LetterTileUI(letter.char, self.game.letters.get_score(letter), letter.player.color, safe=True)
-                item.own(self.board, x, y, move=False)
-                self.scene.addItem(item)
+        for x, y, char in (self.last_event.tiles if self.last_event else ()):
+            item = self.tiles.acquire(char, self.game.letters.get_score(char), player.color, safe=True)
+            item.own(self.board, x, y, move=False)
+            self.scene.addItem(item)
+        self.last_event = None
 
         self.update()
 
         if self.game.get_state() == self.game.RUNNING:
-            self.game.current_player.update_letters()
             self.playerNext()
         else:
             self.update()
@@ -212,30 +316,60 @@ class WindowUI(QWidget):
     def continueClicked(self):
         '''
         Function that gets called when 'Place Word' is clicked
-        Validates word and calculates player's score
-        Also checks that the first word placed on the board has to be in the center tile
-        '''
-        if self.board.validateWord():
-            if type(self.game.current_player) is Player:
-                self.board.currentWord = ''
-                try:
-                    self.game.current_player.place_word()
-                except:
-                    msg = QMessageBox()
-                    msg.setIcon(QMessageBox.Critical)
-                    msg.setText("Oops! First word must be placed on the star spin in the centre of the board.")
-                    msg.setInformativeText("Please try again")
-                    msg.setWindowTitle("Foul play")
-                    msg.exec_()
-                    pass
-        else:
+        Validates every word formed by the new letters and calculates player's score
+        '''
+        if type(self.game.current_player) is not Player:
+            return
+
+        tiles = self.board.getPendingTiles()
+        words, errors = validate_tiles(self.game.board, tiles, self.board.lexicon)
+        try:
+            if errors:
+                raise InvalidMove(errors[0].message, errors)
+            self.game.current_player.place_word(Move(*words[0], tiles))
+        except InvalidMove as e:
+            invalid_word = any(error.code == UNKNOWN_WORD for error in e.errors)
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Critical)
-            msg.setText("Oops! Invalid word")
+            msg.setText("Oops! %s" % e)
             msg.setInformativeText("Please try again")
-            msg.setWindowTitle("Invalid word")
+            msg.setWindowTitle("Invalid word" if invalid_word else "Foul play")
             msg.exec_()
-            pass
+
+    def hintClicked(self):
+        '''
+        Function that gets called when 'Hint' is clicked
+        Looks for the best words for the current rack without blocking the window
+        '''
+        player = self.game.current_player
+        if type(player) is not Player:
+            return
+        self.hint_button.setEnabled(False)
+        self.hint_button.setText('Thinking...')
+        future = self.hints.request(player.letters)
+        future.add_done_callback(lambda f: self.hintReady.emit((player, f)))
+
+    def hintFound(self, hint):
+        '''
+        Show the words found for a hint, unless the turn is over
+        '''
+        player, future = hint
+        self.hint_button.setText('&Hint')
+        self.hint_button.setEnabled(True)
+        if player is not self.game.current_player:
+            return
+
+        moves = future.result()
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Information)
+        msg.setWindowTitle("Hint")
+        if moves:
+            msg.setText("Try one of these words:")
+            msg.setInformativeText('\n'.join('%s at (%i,%i) %s: %i points' % (
+                m.word.upper(), m.x, m.y, m.direction, m.score) for m in moves))
+        else:
+            msg.setText("No word can be placed with these letters.")
+        msg.exec_()
 
     def passClicked(self):
         '''
@@ -257,12 +391,19 @@ class WindowUI(QWidget):
         Function that gets called when 'Exchange' is clicked
         '''
         if type(self.game.current_player) is Player:
-            self.game.current_player.exchange_letters()
+            letters = self.rack.getSelected().lower()
+            self.game.current_player.exchange_letters(letters)
 
     def gameOver(self):
         '''
         Function that determines the winner and ends the game
         '''
+        try:
+            with GameArchive() as archive:
+                archive.append(self.recorder.record())
+        except (OSError, ValueError):
+            pass
+
         winner = sorted(self.game.players, reverse=True, key=attrgetter('score'))[0]
         self.dialog = QMessageBox(QMessageBox.Information, 'Game Over',
                                   ('<b>Game Over!</b><br><br>The player ' +